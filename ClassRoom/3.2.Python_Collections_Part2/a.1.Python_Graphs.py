@@ -1,52 +1,314 @@
 from collections import Counter, defaultdict, OrderedDict
 from collections import namedtuple, deque, ChainMap, UserDict, UserList, UserString
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+import heapq
+import math
+import os
+import pickle
+import random
+import tempfile
+import time
+import tracemalloc
 
 class Graph:
     def __init__(self):
         self.nodes = set()  # To store nodes
         self.edges = dict()  # To store edges with weights
         self.distances = dict()  # To store distances
+        self.reverse_edges = dict()  # To store incoming edges, for searches that run backwards
+        self.listeners = []  # Called as listener(from_node, to_node, old_distance, distance) on every edge change
 
     def add_node(self, value):
         self.nodes.add(value)
 
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
     def add_edge(self, from_node, to_node, distance):
         self._add_directional_edge(from_node, to_node, distance)
         self._add_directional_edge(to_node, from_node, distance)  # This line makes it undirected
 
     def _add_directional_edge(self, from_node, to_node, distance):
-        self.edges.setdefault(from_node, []).append(to_node)
+        old_distance = self.distances.get((from_node, to_node))
+        if old_distance is None:  # Adding an existing edge again only changes its distance
+            self.edges.setdefault(from_node, []).append(to_node)
+            self.reverse_edges.setdefault(to_node, []).append(from_node)
         self.distances[(from_node, to_node)] = distance
+        for listener in self.listeners:
+            listener(from_node, to_node, old_distance, distance)
+
+    def freeze(self):
+        """Compiles the graph into a read-only CSRGraph; later changes to self do not show up in it."""
+        labels = list(self.nodes)
+        ids = {label: node_id for node_id, label in enumerate(labels)}
+        for from_node, to_nodes in self.edges.items():
+            for label in [from_node, *to_nodes]:
+                if label not in ids:  # Reached through an edge but never added with add_node
+                    ids[label] = len(labels)
+                    labels.append(label)
+
+        offsets = array('q', [0])
+        targets = array('q')
+        weight_list = []
+        for from_node in labels:
+            for to_node in self.edges.get(from_node, []):
+                targets.append(ids[to_node])
+                weight_list.append(self.distances[(from_node, to_node)])
+            offsets.append(len(targets))
+        integral = all(isinstance(weight, int) for weight in weight_list)
+        weights = array('q' if integral else 'd', weight_list)
+        return CSRGraph(labels, ids, offsets, targets, weights)
+
+class CSRGraph:
+    """A frozen Graph in compressed sparse row form.
+
+    Node labels are interned to ids 0..n-1. The edges leaving node id u are
+    targets[offsets[u]:offsets[u + 1]], with their distances at the same positions
+    in weights. The three arrays hold machine integers (weights hold floats unless
+    every distance is an int), so an edge costs 16 bytes instead of a list slot,
+    a tuple key and a dictionary entry."""
+    def __init__(self, labels, ids, offsets, targets, weights):
+        self.labels = labels  # Node id -> label
+        self.ids = ids  # Label -> node id
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    def __len__(self):
+        return len(self.labels)
+
+    def neighbors(self, node_id):
+        """Returns the (target id, distance) pairs of the edges leaving node_id."""
+        start, end = self.offsets[node_id], self.offsets[node_id + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+def dijkstra(graph, initial, target=None):
+    """Finds the shortest distances from initial with a binary heap.
+
+    The heap holds (distance, counter, node) entries; the counter breaks ties, so nodes
+    themselves are never compared. A node whose distance improves gets a new entry and
+    the old one is skipped when popped (lazy deletion), so each step is O(log E) instead
+    of a scan over all nodes. If target is given, the search stops as soon as target is
+    settled: its entry in visited is final, while other entries may still be tentative.
+    graph can also be a CSRGraph; the result still uses the node labels."""
+    if isinstance(graph, CSRGraph):
+        return _dijkstra_csr(graph, initial, target)
 
-def dijkstra(graph, initial):
     visited = {initial: 0}
     path = {}
 
-    nodes = set(graph.nodes)
+    tie_breaker = count()
+    heap = [(0, next(tie_breaker), initial)]
 
-    while nodes:
-        min_node = None
-        for node in nodes:
-            if node in visited:
-                if min_node is None:
-                    min_node = node
-                elif visited[node] < visited[min_node]:
-                    min_node = node
+    while heap:
+        current_weight, _, min_node = heapq.heappop(heap)
+        if current_weight > visited[min_node]:
+            continue  # Stale entry: min_node was reached more cheaply since it was pushed
 
-        if min_node is None:
+        if min_node == target:
             break
 
-        nodes.remove(min_node)
-        current_weight = visited[min_node]
-
         for edge in graph.edges.get(min_node, []):
             weight = current_weight + graph.distances[(min_node, edge)]
             if edge not in visited or weight < visited[edge]:
                 visited[edge] = weight
                 path[edge] = min_node
+                heapq.heappush(heap, (weight, next(tie_breaker), edge))
+
+    return visited, path
 
+def _dijkstra_csr(graph, initial, target=None):
+    """dijkstra on a CSRGraph, converting the id-based result back to labels."""
+    distance, previous = _dijkstra_ids(graph, graph.ids[initial], graph.ids.get(target))
+    labels = graph.labels
+    visited = {labels[node_id]: weight for node_id, weight in enumerate(distance) if weight is not None}
+    path = {labels[node_id]: labels[prev] for node_id, prev in enumerate(previous) if prev is not None}
     return visited, path
 
+def _dijkstra_ids(graph, source, target=None):
+    """dijkstra on node ids, with lists in place of the visited and path dictionaries."""
+    distance = [None] * len(graph)
+    previous = [None] * len(graph)
+    distance[source] = 0
+
+    heap = [(0, source)]  # Ids are ints, so they break ties without a counter
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    while heap:
+        current_weight, min_node = heapq.heappop(heap)
+        if current_weight > distance[min_node]:
+            continue
+
+        if min_node == target:
+            break
+
+        start, end = offsets[min_node], offsets[min_node + 1]
+        for edge, edge_weight in zip(targets[start:end], weights[start:end]):
+            weight = current_weight + edge_weight
+            known = distance[edge]
+            if known is None or weight < known:
+                distance[edge] = weight
+                previous[edge] = min_node
+                heapq.heappush(heap, (weight, edge))
+
+    return distance, previous
+
+# Batch queries: one row of distances and predecessors per source node
+
+FLOYD_WARSHALL_MAX_NODES = 100  # O(n^3) beats n heap searches only on small, dense graphs
+
+_worker_graph = None  # The CSRGraph each pool worker searches, set once by _init_worker
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+def _shortest_path_row(source):
+    """Runs in a pool worker: the distance and predecessor rows of one source id."""
+    return _table_row(_worker_graph, source)
+
+def _table_row(graph, source):
+    distance, previous = _dijkstra_ids(graph, source)
+    return ([math.inf if weight is None else weight for weight in distance],
+            array('q', [-1 if prev is None else prev for prev in previous]))
+
+def floyd_warshall(graph):
+    """Computes all-pairs distance and predecessor matrices of a CSRGraph in O(n^3)."""
+    n = len(graph)
+    distances = [[math.inf] * n for _ in range(n)]
+    predecessors = [array('q', [-1]) * n for _ in range(n)]
+    for from_id in range(n):
+        distances[from_id][from_id] = 0
+        for to_id, weight in graph.neighbors(from_id):
+            if weight < distances[from_id][to_id]:
+                distances[from_id][to_id] = weight
+                predecessors[from_id][to_id] = from_id
+
+    for via_id in range(n):
+        via_distances = distances[via_id]
+        via_predecessors = predecessors[via_id]
+        for from_id in range(n):
+            to_via = distances[from_id][via_id]
+            if to_via == math.inf:
+                continue
+            row = distances[from_id]
+            row_predecessors = predecessors[from_id]
+            for to_id, from_via in enumerate(via_distances):
+                if to_via + from_via < row[to_id]:
+                    row[to_id] = to_via + from_via
+                    row_predecessors[to_id] = via_predecessors[to_id]
+    return distances, predecessors
+
+def multi_source_shortest_paths(graph, sources=None, method="auto", processes=None, chunksize=None):
+    """Computes shortest paths from many sources at once.
+
+    graph is a Graph (frozen first) or a CSRGraph; sources defaults to every node. Returns
+    (distances, predecessors) with one row per source, in the order of sources, and one
+    column per node id (see graph.labels): distances[i][j] is math.inf when node j cannot be
+    reached, and predecessors[i][j] is the id of the node before j on the path, or -1.
+
+    method is "dijkstra", "floyd_warshall", or "auto", which picks Floyd-Warshall for
+    graphs of up to FLOYD_WARSHALL_MAX_NODES nodes with at least one edge per four pairs.
+    The Dijkstra searches run in a pool of at most processes workers (default: one per CPU
+    core, never more than there are sources; processes=1 runs them here). Each worker
+    receives its own pickled copy of the graph once, through the pool initializer, so
+    starting the pool costs about one copy of the graph's arrays per worker (some 17 MB
+    each for 100,000 nodes and a million edges). chunksize, the number of sources
+    handed to a worker at a time, defaults to a quarter of each worker's share, so
+    every worker gets some of even a handful of sources."""
+    if isinstance(graph, Graph):
+        graph = graph.freeze()
+    source_ids = [graph.ids[source] for source in (graph.labels if sources is None else sources)]
+    n = len(graph)
+
+    if method == "auto":
+        dense = 4 * len(graph.targets) >= n * n
+        method = "floyd_warshall" if n <= FLOYD_WARSHALL_MAX_NODES and dense else "dijkstra"
+    if method == "floyd_warshall":
+        distances, predecessors = floyd_warshall(graph)
+        return [distances[source] for source in source_ids], [predecessors[source] for source in source_ids]
+    if method != "dijkstra":
+        raise ValueError(f"Unknown method: {method}")
+
+    if processes == 1 or len(source_ids) <= 1:  # No sources or one: not worth starting a pool
+        rows = [_table_row(graph, source) for source in source_ids]
+    else:
+        workers = min(processes or os.cpu_count() or 1, len(source_ids))
+        if chunksize is None:
+            chunksize = max(1, len(source_ids) // (workers * 4))
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(graph,)) as executor:
+            rows = list(executor.map(_shortest_path_row, source_ids, chunksize=chunksize))
+    return [row[0] for row in rows], [row[1] for row in rows]
+
+def table_path(graph, predecessors, from_node, to_node):
+    """Reconstructs a route from one row of predecessors, like shortest_path does from a path dictionary."""
+    to_id = graph.ids[to_node]
+    from_id = graph.ids[from_node]
+    if to_id != from_id and predecessors[to_id] == -1:
+        return "Path does not exist"
+
+    path_reversed = [to_id]
+    while path_reversed[-1] != from_id:
+        path_reversed.append(predecessors[path_reversed[-1]])
+    return [graph.labels[node_id] for node_id in reversed(path_reversed)]
+
+def bfs(graph, start):
+    """Returns the nodes reachable from start in breadth-first order, on a Graph or a CSRGraph."""
+    if isinstance(graph, CSRGraph):
+        offsets, targets = graph.offsets, graph.targets
+        source = graph.ids[start]
+        seen = bytearray(len(graph))  # One byte per node instead of a set entry
+        seen[source] = 1
+        order = [source]
+        for node_id in order:  # order doubles as the queue
+            for edge in targets[offsets[node_id]:offsets[node_id + 1]]:
+                if not seen[edge]:
+                    seen[edge] = 1
+                    order.append(edge)
+        return [graph.labels[node_id] for node_id in order]
+
+    seen = {start}
+    order = [start]
+    for node in order:
+        for edge in graph.edges.get(node, []):
+            if edge not in seen:
+                seen.add(edge)
+                order.append(edge)
+    return order
+
+def dfs(graph, start):
+    """Returns the nodes reachable from start in depth-first preorder, on a Graph or a CSRGraph."""
+    if isinstance(graph, CSRGraph):
+        offsets, targets = graph.offsets, graph.targets
+        seen = bytearray(len(graph))
+        order = []
+        stack = [graph.ids[start]]
+        while stack:
+            node_id = stack.pop()
+            if seen[node_id]:
+                continue
+            seen[node_id] = 1
+            order.append(node_id)
+            # Push in reverse, so neighbours are visited in edge order
+            stack.extend(reversed(targets[offsets[node_id]:offsets[node_id + 1]]))
+        return [graph.labels[node_id] for node_id in order]
+
+    seen = set()
+    order = []
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        order.append(node)
+        stack.extend(reversed(graph.edges.get(node, [])))
+    return order
+
 def shortest_path(from_node, to_node, path):
     """Reconstructs the shortest path from from_node to to_node based on the provided path dictionary."""
     if to_node not in path:
@@ -60,27 +322,612 @@ def shortest_path(from_node, to_node, path):
 
     return path_reversed[::-1]  # Reverse the path to get it in the correct order from source to target
 
+# Point-to-point queries: search only as much of the graph as one route needs
+
+def bidirectional_dijkstra(graph, from_node, to_node):
+    """Finds the shortest route from from_node to to_node, searching forward from from_node
+    and backward (along reverse_edges) from to_node at the same time.
+
+    Each side expands its closest unsettled node, and the search stops once the two
+    closest frontier distances add up to the best route seen so far, so both sides
+    only cover a ball of about half the route's length. Returns (distance, path), or
+    (math.inf, "Path does not exist") when to_node cannot be reached."""
+    if from_node == to_node:
+        return 0, [from_node]
+
+    tie_breaker = count()
+    visited = ({from_node: 0}, {to_node: 0})  # Forward and backward distances
+    path = ({}, {})  # Forward: node -> previous node; backward: node -> next node
+    heaps = ([(0, next(tie_breaker), from_node)], [(0, next(tie_breaker), to_node)])
+    neighbours = (graph.edges, graph.reverse_edges)
+    best_distance, meeting_edge = math.inf, None  # The edge where the two searches join
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best_distance:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        other = 1 - side
+        current_weight, _, min_node = heapq.heappop(heaps[side])
+        if current_weight > visited[side][min_node]:
+            continue  # Stale entry
+
+        for edge in neighbours[side].get(min_node, []):
+            edge_key = (min_node, edge) if side == 0 else (edge, min_node)
+            weight = current_weight + graph.distances[edge_key]
+            if edge not in visited[side] or weight < visited[side][edge]:
+                visited[side][edge] = weight
+                path[side][edge] = min_node
+                heapq.heappush(heaps[side], (weight, next(tie_breaker), edge))
+            if edge in visited[other] and weight + visited[other][edge] < best_distance:
+                best_distance = weight + visited[other][edge]
+                meeting_edge = edge_key
+
+    if meeting_edge is None:
+        return math.inf, "Path does not exist"
+    forward_node, current_node = meeting_edge
+    route = shortest_path(from_node, forward_node, path[0]) if forward_node != from_node else [from_node]
+    route.append(current_node)
+    while current_node != to_node:
+        current_node = path[1][current_node]
+        route.append(current_node)
+    return best_distance, route
+
+def a_star(graph, from_node, to_node, heuristic):
+    """Finds the shortest route from from_node to to_node, guided by heuristic(node, to_node).
+
+    The heuristic estimates the remaining distance; nodes are expanded in order of
+    distance so far plus estimate, so the search heads towards to_node instead of
+    spreading evenly. The route is shortest as long as the heuristic never overestimates
+    and never drops by more than an edge's distance along that edge (straight-line
+    distance on a map does both). A heuristic of 0 turns this back into dijkstra.
+    Returns (distance, path), or (math.inf, "Path does not exist")."""
+    visited = {from_node: 0}
+    path = {}
+
+    tie_breaker = count()
+    heap = [(heuristic(from_node, to_node), next(tie_breaker), 0, from_node)]
+
+    while heap:
+        _, _, current_weight, min_node = heapq.heappop(heap)
+        if current_weight > visited[min_node]:
+            continue  # Stale entry
+
+        if min_node == to_node:
+            route = shortest_path(from_node, to_node, path) if to_node != from_node else [from_node]
+            return current_weight, route
+
+        for edge in graph.edges.get(min_node, []):
+            weight = current_weight + graph.distances[(min_node, edge)]
+            if edge not in visited or weight < visited[edge]:
+                visited[edge] = weight
+                path[edge] = min_node
+                heapq.heappush(heap, (weight + heuristic(edge, to_node), next(tie_breaker), weight, edge))
+
+    return math.inf, "Path does not exist"
+
+# Contraction hierarchy: preprocess once, then answer each route query from two tiny searches
+
+class ContractionHierarchy:
+    """A Graph preprocessed for fast repeated point-to-point queries.
+
+    Nodes are contracted one at a time, least important first. Contracting v removes it
+    from the graph; for each pair of neighbours u -> v -> w whose only shortest connection
+    ran through v, a shortcut u -> w is added that remembers v as its middle node. A
+    query then searches upward from both ends (only towards nodes contracted later) and
+    meets at the most important node of the route, so it settles a few hundred nodes
+    at most, whatever the size of the graph."""
+    def __init__(self, graph, witness_limit=60):
+        # Remaining graph during contraction, with only the shortest of any parallel edges
+        out_edges = {node: {} for node in graph.nodes}
+        in_edges = {node: {} for node in graph.nodes}
+        for from_node, to_nodes in graph.edges.items():
+            for to_node in to_nodes:
+                if from_node == to_node:
+                    continue  # A loop never shortens a route
+                out_edges.setdefault(from_node, {})
+                in_edges.setdefault(from_node, {})
+                out_edges.setdefault(to_node, {})
+                in_edges.setdefault(to_node, {})
+                out_edges[from_node][to_node] = graph.distances[(from_node, to_node)]
+                in_edges[to_node][from_node] = graph.distances[(from_node, to_node)]
+        self.out_edges = out_edges
+        self.in_edges = in_edges
+        self.witness_limit = witness_limit  # Nodes a witness search may settle before giving up
+
+        self.rank = {}  # Node -> contraction order; queries only move to higher ranks
+        self.upward = {node: [] for node in out_edges}  # node -> [(higher node, distance)]
+        self.downward = {node: [] for node in out_edges}  # node -> [(higher node, distance)], reversed
+        self.middle = {}  # Shortcut (from_node, to_node) -> the node it skips
+        contracted_neighbours = dict.fromkeys(out_edges, 0)
+
+        tie_breaker = count()
+        heap = [(self._priority(node, contracted_neighbours), next(tie_breaker), node) for node in out_edges]
+        heapq.heapify(heap)
+        while heap:
+            _, _, node = heapq.heappop(heap)
+            # Priorities go stale as neighbours are contracted: recompute, and put the node
+            # back if it is no longer the least important one
+            priority = self._priority(node, contracted_neighbours)
+            if heap and priority > heap[0][0]:
+                heapq.heappush(heap, (priority, next(tie_breaker), node))
+                continue
+            for neighbour in set(out_edges[node]) | set(in_edges[node]):
+                contracted_neighbours[neighbour] += 1
+            self._contract(node)
+
+        del self.out_edges, self.in_edges
+
+    def _witness_distances(self, source, excluded, max_distance):
+        """Dijkstra from source in the remaining graph without excluded, up to max_distance."""
+        visited = {source: 0}
+        tie_breaker = count()
+        heap = [(0, next(tie_breaker), source)]
+        settled = 0
+        while heap and settled < self.witness_limit:
+            current_weight, _, min_node = heapq.heappop(heap)
+            if current_weight > visited[min_node]:
+                continue
+            if current_weight > max_distance:
+                break
+            settled += 1
+            for edge, distance in self.out_edges[min_node].items():
+                weight = current_weight + distance
+                if edge != excluded and (edge not in visited or weight < visited[edge]):
+                    visited[edge] = weight
+                    heapq.heappush(heap, (weight, next(tie_breaker), edge))
+        return visited
+
+    def _shortcuts(self, node):
+        """Returns the (from_node, to_node, distance) shortcuts that contracting node needs."""
+        shortcuts = []
+        out_edges = self.out_edges[node]
+        for from_node, in_distance in self.in_edges[node].items():
+            targets = [to_node for to_node in out_edges if to_node != from_node]
+            if not targets:
+                continue
+            max_distance = in_distance + max(out_edges[to_node] for to_node in targets)
+            witness = self._witness_distances(from_node, node, max_distance)
+            for to_node in targets:
+                distance = in_distance + out_edges[to_node]
+                # A witness path avoiding node is as short: no shortcut needed
+                if witness.get(to_node, math.inf) > distance:
+                    shortcuts.append((from_node, to_node, distance))
+        return shortcuts
+
+    def _priority(self, node, contracted_neighbours):
+        """Edge difference plus contracted neighbours: contract cheap, uncrowded nodes first."""
+        removed = len(self.out_edges[node]) + len(self.in_edges[node])
+        return len(self._shortcuts(node)) - removed + contracted_neighbours[node]
+
+    def _contract(self, node):
+        for from_node, to_node, distance in self._shortcuts(node):
+            if distance < self.out_edges[from_node].get(to_node, math.inf):
+                self.out_edges[from_node][to_node] = distance
+                self.in_edges[to_node][from_node] = distance
+                self.middle[(from_node, to_node)] = node
+
+        # Every remaining neighbour is contracted later, so the edges to it point upward
+        self.rank[node] = len(self.rank)
+        for to_node, distance in self.out_edges.pop(node).items():
+            self.upward[node].append((to_node, distance))
+            del self.in_edges[to_node][node]
+        for from_node, distance in self.in_edges.pop(node).items():
+            self.downward[node].append((from_node, distance))
+            del self.out_edges[from_node][node]
+
+    def query(self, from_node, to_node):
+        """Returns (distance, path) like bidirectional_dijkstra, or (math.inf, "Path does not exist")."""
+        if from_node == to_node:
+            return 0, [from_node]
+        if from_node not in self.rank or to_node not in self.rank:
+            return math.inf, "Path does not exist"
+
+        visited = ({from_node: 0}, {to_node: 0})
+        path = ({}, {})
+        tie_breaker = count()
+        heaps = ([(0, next(tie_breaker), from_node)], [(0, next(tie_breaker), to_node)])
+        edges = (self.upward, self.downward)
+        best_distance, meeting_node = math.inf, None
+
+        # Both searches only climb, so neither can stop at the first meeting; each runs
+        # until its closest unsettled node is farther than the best route found
+        while heaps[0] or heaps[1]:
+            side = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+            current_weight, _, min_node = heapq.heappop(heaps[side])
+            if current_weight >= best_distance:
+                heaps[side].clear()
+                continue
+            if current_weight > visited[side][min_node]:
+                continue
+
+            if min_node in visited[1 - side]:
+                total = current_weight + visited[1 - side][min_node]
+                if total < best_distance:
+                    best_distance, meeting_node = total, min_node
+
+            for edge, distance in edges[side][min_node]:
+                weight = current_weight + distance
+                if edge not in visited[side] or weight < visited[side][edge]:
+                    visited[side][edge] = weight
+                    path[side][edge] = min_node
+                    heapq.heappush(heaps[side], (weight, next(tie_breaker), edge))
+
+        if meeting_node is None:
+            return math.inf, "Path does not exist"
+
+        route = [meeting_node]
+        while route[-1] != from_node:
+            route.append(path[0][route[-1]])
+        route.reverse()
+        current_node = meeting_node
+        while current_node != to_node:
+            current_node = path[1][current_node]
+            route.append(current_node)
+        return best_distance, self._unpack(route)
+
+    def _unpack(self, route):
+        """Replaces every shortcut on route with the original edges it stands for."""
+        unpacked = [route[0]]
+        stack = [(from_node, to_node) for from_node, to_node in zip(route, route[1:])][::-1]
+        while stack:
+            from_node, to_node = stack.pop()
+            node = self.middle.get((from_node, to_node))
+            if node is None:
+                unpacked.append(to_node)
+            else:
+                stack.append((node, to_node))
+                stack.append((from_node, node))
+        return unpacked
+
+    def save(self, file_path):
+        """Writes the hierarchy to file_path, to be reloaded with ContractionHierarchy.load."""
+        with open(file_path, "wb") as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, "rb") as file:
+            return pickle.load(file)
+
+def verify_contraction_hierarchy(graph, hierarchy, queries=1000, seed=0):
+    """Compares hierarchy.query with dijkstra on random node pairs of graph.
+
+    Returns the list of (from_node, to_node, expected, got) mismatches; a route counts as
+    correct when it has dijkstra's distance, starts and ends at the right nodes and its
+    edges add up to that distance (ties may pick a different route of equal length)."""
+    rng = random.Random(seed)
+    nodes = sorted(graph.nodes, key=repr)
+    mismatches = []
+    for _ in range(queries):
+        from_node, to_node = rng.choice(nodes), rng.choice(nodes)
+        expected = dijkstra(graph, from_node, target=to_node)[0].get(to_node, math.inf)
+        distance, route = hierarchy.query(from_node, to_node)
+        if distance == math.inf:
+            correct = expected == math.inf and route == "Path does not exist"
+        else:
+            route_distance = sum(graph.distances[edge] for edge in zip(route, route[1:]))
+            correct = (distance == expected == route_distance
+                       and route[0] == from_node and route[-1] == to_node)
+        if not correct:
+            mismatches.append((from_node, to_node, expected, distance))
+    return mismatches
+
+# Dynamic shortest paths: repair the cached tree after each edge change instead of starting over
+
+class DynamicShortestPaths:
+    """The dijkstra result for one source, kept up to date as the graph's edges change.
+
+    visited and path have the same meaning as in dijkstra's result, so shortest_path
+    works on them at any time. The object subscribes to the graph; after every edge
+    change it repairs only the part of the shortest-path tree the change affects, in the
+    style of Ramalingam and Reps, and appends the number of nodes whose distance or
+    predecessor it had to recompute to touched."""
+    def __init__(self, graph, source):
+        self.graph = graph
+        self.source = source
+        self.visited, self.path = dijkstra(graph, source)
+        self.children = {}  # Node -> the nodes whose predecessor it is, to walk subtrees
+        for node, previous in self.path.items():
+            self.children.setdefault(previous, set()).add(node)
+        self.touched = []
+        graph.subscribe(self.edge_changed)
+
+    def _set_previous(self, node, previous):
+        old_previous = self.path.get(node)
+        if old_previous is not None:
+            self.children[old_previous].discard(node)
+        if previous is None:
+            self.path.pop(node, None)
+        else:
+            self.path[node] = previous
+            self.children.setdefault(previous, set()).add(node)
+
+    def edge_changed(self, from_node, to_node, old_distance, distance):
+        """Graph listener: repairs the tree after the edge from_node -> to_node changed."""
+        if to_node == self.source or from_node not in self.visited:
+            self.touched.append(0)  # Routes never enter the source, or start from an unreached node
+        elif self.visited[from_node] + distance < self.visited.get(to_node, math.inf):
+            self.touched.append(self._decrease(from_node, to_node, distance))
+        elif self.path.get(to_node) == from_node and old_distance is not None and distance > old_distance:
+            self.touched.append(self._increase(to_node))
+        else:
+            self.touched.append(0)  # The edge is not on the tree and does not shorten any route
+
+    def _decrease(self, from_node, to_node, distance):
+        """Spreads a shorter distance to to_node outward, as far as it improves anything."""
+        tie_breaker = count()
+        self.visited[to_node] = self.visited[from_node] + distance
+        self._set_previous(to_node, from_node)
+        heap = [(self.visited[to_node], next(tie_breaker), to_node)]
+        touched = 0
+        while heap:
+            current_weight, _, min_node = heapq.heappop(heap)
+            if current_weight > self.visited[min_node]:
+                continue
+            touched += 1
+            for edge in self.graph.edges.get(min_node, []):
+                weight = current_weight + self.graph.distances[(min_node, edge)]
+                if weight < self.visited.get(edge, math.inf):
+                    self.visited[edge] = weight
+                    self._set_previous(edge, min_node)
+                    heapq.heappush(heap, (weight, next(tie_breaker), edge))
+        return touched
+
+    def _increase(self, node):
+        """Recomputes the subtree below node, whose tree edge just got longer.
+
+        Only nodes in that subtree can get farther from the source. Each of them first
+        takes its best distance through an incoming edge from outside the subtree; a
+        dijkstra restricted to the subtree then settles the rest."""
+        affected = [node]
+        for affected_node in affected:
+            affected.extend(self.children.get(affected_node, ()))
+        affected = set(affected)
+        for affected_node in affected:
+            del self.visited[affected_node]
+            self._set_previous(affected_node, None)
+
+        tie_breaker = count()
+        heap = []
+        for affected_node in affected:
+            for previous in self.graph.reverse_edges.get(affected_node, []):
+                if previous in self.visited:
+                    weight = self.visited[previous] + self.graph.distances[(previous, affected_node)]
+                    if weight < self.visited.get(affected_node, math.inf):
+                        self.visited[affected_node] = weight
+                        self._set_previous(affected_node, previous)
+            if affected_node in self.visited:
+                heapq.heappush(heap, (self.visited[affected_node], next(tie_breaker), affected_node))
+
+        while heap:
+            current_weight, _, min_node = heapq.heappop(heap)
+            if current_weight > self.visited[min_node]:
+                continue
+            for edge in self.graph.edges.get(min_node, []):
+                if edge not in affected:
+                    continue  # Distances outside the subtree cannot have changed
+                weight = current_weight + self.graph.distances[(min_node, edge)]
+                if weight < self.visited.get(edge, math.inf):
+                    self.visited[edge] = weight
+                    self._set_previous(edge, min_node)
+                    heapq.heappush(heap, (weight, next(tie_breaker), edge))
+        return len(affected)
+
+# Benchmarks on large graphs: each one takes from seconds to a minute, so the examples
+# below only run them when their call is uncommented
+
+def build_big_graph(seed=0, nodes=100000, roads=500000):
+    """A random road network with the given numbers of nodes and roads, each road 1 to 100 long."""
+    rng = random.Random(seed)
+    graph = Graph()
+    for node in range(nodes):
+        graph.add_node(node)
+    for _ in range(roads):
+        graph.add_edge(rng.randrange(nodes), rng.randrange(nodes), rng.randint(1, 100))
+    return graph
+
+def build_grid(size, max_block, seed=0):
+    """A size x size street grid whose corners are (x, y) and whose blocks are 1 to max_block long."""
+    rng = random.Random(seed)
+    grid = Graph()
+    for x in range(size):
+        for y in range(size):
+            grid.add_node((x, y))
+            if x:
+                grid.add_edge((x - 1, y), (x, y), rng.randint(1, max_block))
+            if y:
+                grid.add_edge((x, y - 1), (x, y), rng.randint(1, max_block))
+    return grid
+
+def manhattan(node, target):
+    """Grid distance between two corners; never more than the route, since every block is at least 1 long."""
+    return abs(node[0] - target[0]) + abs(node[1] - target[1])
+
+def measure_memory(build):
+    """Returns the bytes allocated by build() that are still in use when it returns."""
+    tracemalloc.start()
+    result = build()
+    allocated, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated, result
+
+def benchmark_dijkstra():
+    """Times dijkstra on the big road network, for every distance and for a single target."""
+    big_graph = build_big_graph()
+    start = time.perf_counter()
+    visited, path = dijkstra(big_graph, 0)
+    print(f"All {len(visited)} distances from node 0 in {time.perf_counter() - start:.2f} seconds")
+    start = time.perf_counter()
+    visited, path = dijkstra(big_graph, 0, target=1)
+    print(f"Distance to node 1 ({visited[1]}) in {time.perf_counter() - start:.2f} seconds")
+
+def compare_csr_memory():
+    """Compares the memory and search speed of the big road network as a Graph and as a CSRGraph."""
+    graph_bytes, big_graph = measure_memory(build_big_graph)
+    csr_bytes, big_csr = measure_memory(big_graph.freeze)
+    print(f"Graph: {graph_bytes / 2**20:.0f} MB, CSRGraph: {csr_bytes / 2**20:.0f} MB")
+    for name, searched_graph in [("Graph", big_graph), ("CSRGraph", big_csr)]:
+        start = time.perf_counter()
+        dijkstra(searched_graph, 0)
+        bfs(searched_graph, 0)
+        print(f"{name}: dijkstra and bfs from node 0 in {time.perf_counter() - start:.2f} seconds")
+
+def benchmark_multi_source(sources=4):
+    """Times multi_source_shortest_paths for a few sources of the big road network, here and in a pool."""
+    big_csr = build_big_graph().freeze()
+    for processes in (1, None):
+        start = time.perf_counter()
+        distances, predecessors = multi_source_shortest_paths(big_csr, range(sources), processes=processes)
+        print(f"processes={processes}: {len(distances)} rows of {len(distances[0])} in {time.perf_counter() - start:.2f} seconds")
+
+def benchmark_point_to_point(size=300, start_corner=(100, 100), end_corner=(140, 120)):
+    """Times one route across a size x size grid with each search mode."""
+    grid = build_grid(size, 3, seed=1)
+    queries = [
+        ("dijkstra", lambda: dijkstra(grid, start_corner)[0][end_corner]),
+        ("dijkstra with target", lambda: dijkstra(grid, start_corner, target=end_corner)[0][end_corner]),
+        ("bidirectional_dijkstra", lambda: bidirectional_dijkstra(grid, start_corner, end_corner)[0]),
+        ("a_star", lambda: a_star(grid, start_corner, end_corner, manhattan)[0]),
+    ]
+    for name, query in queries:
+        start = time.perf_counter()
+        distance = query()
+        print(f"{name}: distance {distance} in {time.perf_counter() - start:.3f} seconds")
+
+def benchmark_contraction_hierarchy(size=100, queries=200, seed=2):
+    """Times contracting a size x size city and compares its queries with the searches on the full graph."""
+    city = build_grid(size, 9, seed=seed)
+    start = time.perf_counter()
+    hierarchy = ContractionHierarchy(city)
+    print(f"Contracted {len(city.nodes)} corners in {time.perf_counter() - start:.1f} seconds")
+    print("Mismatches with dijkstra:", len(verify_contraction_hierarchy(city, hierarchy, queries=300)))
+
+    rng = random.Random(seed)
+    pairs = [((rng.randrange(size), rng.randrange(size)), (rng.randrange(size), rng.randrange(size)))
+             for _ in range(queries)]
+    for name, query in [("dijkstra with target", lambda a, b: dijkstra(city, a, target=b)),
+                        ("bidirectional_dijkstra", lambda a, b: bidirectional_dijkstra(city, a, b)),
+                        ("ContractionHierarchy.query", hierarchy.query)]:
+        start = time.perf_counter()
+        for from_node, to_node in pairs:
+            query(from_node, to_node)
+        print(f"{name}: {(time.perf_counter() - start) / len(pairs) * 1000:.2f} ms per query")
+
+def benchmark_dynamic_routes(size=100, changes=1000, seed=2):
+    """Times repairing the routes from corner (0, 0) of a size x size city while roads change one at a time."""
+    city = build_grid(size, 9, seed=seed)
+    rng = random.Random(seed)
+    routes = DynamicShortestPaths(city, (0, 0))
+    roads = [((x, y), (x + 1, y)) for x in range(size - 1) for y in range(size)]
+    start = time.perf_counter()
+    for _ in range(changes):
+        from_node, to_node = rng.choice(roads)
+        city.add_edge(from_node, to_node, rng.randint(1, 9))  # Notifies routes twice, once per direction
+    elapsed = time.perf_counter() - start
+    print(f"{len(routes.touched)} repairs in {elapsed:.2f} seconds, "
+          f"{sum(routes.touched) / len(routes.touched):.0f} of {len(city.nodes)} nodes touched on average")
+    print("Same as a fresh dijkstra:", routes.visited == dijkstra(city, (0, 0))[0])
+    start = time.perf_counter()
+    dijkstra(city, (0, 0))
+    print(f"One full dijkstra: {time.perf_counter() - start:.3f} seconds")
+
 # Example usage
-graph = Graph()
-graph.add_node("A")
-graph.add_node("B")
-graph.add_node("C")
-graph.add_node("D")
-graph.add_node("E")
-graph.add_node("F")
-
-graph.add_edge("A", "B", 4)
-graph.add_edge("A", "C", 2)
-graph.add_edge("B", "C", 5)
-graph.add_edge("B", "D", 10)
-graph.add_edge("C", "D", 3)
-graph.add_edge("D", "E", 4)
-graph.add_edge("E", "F", 2)
-
-visited, path = dijkstra(graph, 'A')  # Find shortest path from node 'A' to all other nodes
-print("Visited:", visited)
-print("Path:", path)
-
-# Find and print the shortest path from 'A' to 'E'
-shortest_path_A_to_E = shortest_path('A', 'E', path)
-print("Shortest path from A to E:", shortest_path_A_to_E)
+if __name__ == "__main__":  # Pool workers import this file, so they must not run the examples
+    graph = Graph()
+    graph.add_node("A")
+    graph.add_node("B")
+    graph.add_node("C")
+    graph.add_node("D")
+    graph.add_node("E")
+    graph.add_node("F")
+
+    graph.add_edge("A", "B", 4)
+    graph.add_edge("A", "C", 2)
+    graph.add_edge("B", "C", 5)
+    graph.add_edge("B", "D", 10)
+    graph.add_edge("C", "D", 3)
+    graph.add_edge("D", "E", 4)
+    graph.add_edge("E", "F", 2)
+
+    visited, path = dijkstra(graph, 'A')  # Find shortest path from node 'A' to all other nodes
+    print("Visited:", visited)
+    print("Path:", path)
+
+    # Find and print the shortest path from 'A' to 'E'
+    shortest_path_A_to_E = shortest_path('A', 'E', path)
+    print("Shortest path from A to E:", shortest_path_A_to_E)
+
+    # Stop early: only the nodes closer to 'A' than 'D' are settled
+    visited, path = dijkstra(graph, 'A', target='D')
+    print("Distance from A to D:", visited['D'])  # Output: Distance from A to D: 5
+    print("Shortest path from A to D:", shortest_path('A', 'D', path))  # Output: ['A', 'C', 'D']
+
+    # A large random road network: 100,000 nodes and 500,000 roads
+    # benchmark_dijkstra()
+    # Output: a few seconds for all distances, a fraction of that for a single target; the old scan
+    # over every node per step would need tens of minutes at this size
+
+    # Freeze the graph into compressed sparse row arrays: same answers, less memory
+    frozen_graph = graph.freeze()
+    print("Distances on the frozen graph:", dijkstra(frozen_graph, 'A')[0] == dijkstra(graph, 'A')[0])  # Output: True
+    print("BFS from A:", bfs(frozen_graph, 'A'))  # Output: BFS from A: ['A', 'B', 'C', 'D', 'E', 'F']
+    print("DFS from A:", dfs(graph, 'A'))  # Output: DFS from A: ['A', 'B', 'C', 'D', 'E', 'F']
+
+    # compare_csr_memory()
+    # Output: the CSRGraph takes about a sixth of the memory (most of what is left is the
+    # label <-> id tables) and searches it two to three times faster
+
+    # Routing tables: every source at once; this small, dense graph goes to Floyd-Warshall
+    distances, predecessors = multi_source_shortest_paths(frozen_graph)
+    for source, row in zip(frozen_graph.labels, distances):
+        print(source, dict(zip(frozen_graph.labels, row)))
+    route = table_path(frozen_graph, predecessors[frozen_graph.ids['A']], 'A', 'E')
+    print("Shortest path from A to E:", route)  # Output: Shortest path from A to E: ['A', 'C', 'D', 'E']
+
+    # Four sources of the large network, in this process and in a pool of worker processes
+    # benchmark_multi_source()
+    # Output: with four or more CPU cores, each source gets a worker of its own, so the pool
+    # takes about a quarter of the time plus the startup cost of copying the graph into
+    # each worker; on a single core it is slightly slower than processes=1
+
+    # One route at a time: bidirectional Dijkstra and A* answer without a full search
+    print(bidirectional_dijkstra(graph, 'A', 'F'))  # Output: (11, ['A', 'C', 'D', 'E', 'F'])
+    print(a_star(graph, 'A', 'F', lambda node, target: 0))  # Output: (11, ['A', 'C', 'D', 'E', 'F'])
+    graph.add_node("G")  # No roads lead to G
+    print(bidirectional_dijkstra(graph, 'A', 'G'))  # Output: (inf, 'Path does not exist')
+
+    # On a street grid the Manhattan distance between two corners guides A* towards the target
+    small_grid = build_grid(10, 3, seed=1)
+    print(a_star(small_grid, (0, 0), (4, 2), manhattan)[0] == dijkstra(small_grid, (0, 0))[0][(4, 2)])  # Output: True
+
+    # A 300 x 300 street grid
+    # benchmark_point_to_point()
+    # Output: the same distance four times; each point-to-point mode settles a small part
+    # of the 90,000 corners and answers many times faster than the full dijkstra
+
+    # Contraction hierarchy: slow preprocessing once, then every query is a tiny search
+    city = build_grid(10, 9, seed=2)
+    hierarchy = ContractionHierarchy(city)
+    hierarchy_path = os.path.join(tempfile.mkdtemp(), "city.ch")
+    hierarchy.save(hierarchy_path)
+    hierarchy = ContractionHierarchy.load(hierarchy_path)
+    print(hierarchy.query((0, 0), (2, 1)))  # Output: the distance and the corners on the route
+    print("Mismatches with dijkstra:", len(verify_contraction_hierarchy(city, hierarchy, queries=300)))  # Output: 0
+
+    # The same on a 100 x 100 city, against the searches on the full graph
+    # benchmark_contraction_hierarchy()
+    # Output: the hierarchy answers in about a millisecond, some twenty times faster than
+    # either search on the full graph, because each side settles only a couple hundred nodes
+
+    # Dynamic shortest paths: traffic changes one road at a time, and the routes from
+    # corner (0, 0) are repaired instead of recomputed
+    routes = DynamicShortestPaths(city, (0, 0))
+    city.add_edge((0, 0), (1, 0), 1)  # Notifies routes twice, once per direction
+    city.add_edge((1, 0), (2, 0), 9)
+    print("Same as a fresh dijkstra:", routes.visited == dijkstra(city, (0, 0))[0])  # Output: True
+    print("Route to (3, 2):", shortest_path((0, 0), (3, 2), routes.path))
+
+    # A thousand changes on the 100 x 100 city
+    # benchmark_dynamic_routes()
+    # Output: most changes touch no node or a handful; a repair costs a small fraction of
+    # the full dijkstra it replaces
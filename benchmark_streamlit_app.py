@@ -0,0 +1,216 @@
+"""
+Latency benchmarks for the hot paths of streamlit_app.
+
+Generates synthetic content trees of Markdown lessons and times cold start, warm
+start, warm rerun, file switch and search against each of them. Search is timed both
+as the bare ranking and as the full per-query path of the search box (sync, update
+check, ranking and snippets). Results are written as JSON so runs can be compared to
+catch regressions.
+
+Usage:
+    python benchmark_streamlit_app.py --sizes 1000 10000 100000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import streamlit_app
+
+# Lessons per synthetic module directory
+FILES_PER_DIR = 100
+
+# Vocabulary of the synthetic lessons; a few common words and a long tail of rare ones
+COMMON_WORDS = ["python", "list", "loop", "function", "class", "data", "value", "example"]
+RARE_WORDS = [f"term{i}" for i in range(5000)]
+
+SEARCH_QUERIES = ["python function", "term42", "loop example term7", "class data value"]
+
+def generate_tree(root, file_count, words_per_file=300, seed=0):
+    """
+    Writes file_count Markdown lessons under root, FILES_PER_DIR per module directory.
+
+    Parameters:
+    - root: str, directory to create the tree in.
+    - file_count: int, number of Markdown files.
+    - words_per_file: int, body length of each lesson.
+    - seed: int, seed for the content generator.
+
+    Returns:
+    - list, paths of the generated files.
+    """
+    rng = random.Random(seed)
+    words = COMMON_WORDS * 50 + RARE_WORDS
+    paths = []
+    for number in range(file_count):
+        module, lesson = divmod(number, FILES_PER_DIR)
+        directory = os.path.join(root, f"Module{module // 10}", f"{module}.0.Section_{module}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{lesson // 10}.{lesson % 10}.{lesson}.Lesson_{number}.md")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(f"# Lesson {number}\n\n")
+            for heading in range(3):
+                file.write(f"## Part {heading}\n\n{' '.join(rng.choices(words, k=words_per_file // 3))}\n\n")
+        paths.append(path)
+    return paths
+
+def legacy_list_markdown_files(startpath):
+    """
+    The original os.walk listing, kept as the baseline the index is measured against.
+    """
+    markdown_files = {}
+    for root, dirs, files in os.walk(startpath):
+        markdown_paths = {file: os.path.join(root, file) for file in files if file.endswith('.md')}
+        if markdown_paths:
+            markdown_files[os.path.relpath(root, startpath)] = markdown_paths
+    return markdown_files
+
+def measure(function, repeat):
+    """
+    Runs function repeat times and returns the timings in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def summarize(size, name, timings):
+    return {
+        "files": size,
+        "benchmark": name,
+        "runs": len(timings),
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+    }
+
+def rerun(content_index):
+    """
+    Does the index work of one sidebar interaction: sync, then walk the first branch.
+    """
+    content_index.sync()
+    relative_dir = "."
+    while True:
+        subdirs = content_index.child_dirs(relative_dir)
+        if not subdirs:
+            break
+        relative_dir = streamlit_app._join_relative(relative_dir, subdirs[0])
+    return content_index.sorted_files(relative_dir)
+
+def benchmark_tree(size, repeat, workdir):
+    """
+    Runs every benchmark against a freshly generated tree of size files.
+
+    Returns:
+    - list, one result dictionary per benchmark.
+    """
+    root = os.path.join(workdir, f"tree-{size}")
+    paths = generate_tree(root, size)
+    cache_dir = os.path.join(workdir, f"cache-{size}")
+    index_path = os.path.join(cache_dir, "content-index.json")
+    results = []
+
+    def cold_start():
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        content_index = streamlit_app.ContentIndex(root, index_path=index_path)
+        content_index.refresh()
+        content_index.sorted_dirs()
+        # The viewer saves in the background; write it here so warm_start has a file to load
+        content_index.save()
+
+    results.append(summarize(size, "legacy_walk", measure(lambda: legacy_list_markdown_files(root), repeat)))
+    results.append(summarize(size, "cold_start", measure(cold_start, repeat)))
+
+    def warm_start():
+        content_index = streamlit_app.ContentIndex(root, index_path=index_path)
+        content_index.refresh()
+        content_index.sorted_dirs()
+
+    results.append(summarize(size, "warm_start", measure(warm_start, repeat)))
+
+    content_index = streamlit_app.ContentIndex(root, index_path=index_path)
+    content_index.refresh()
+    results.append(summarize(size, "warm_rerun", measure(lambda: rerun(content_index), repeat)))
+    content_index.watched = True
+    results.append(summarize(size, "warm_rerun_watched", measure(lambda: rerun(content_index), repeat)))
+
+    rng = random.Random(size)
+    content_cache = streamlit_app.ContentCache()
+    switch_paths = iter(rng.sample(paths, min(len(paths), repeat)))
+    results.append(summarize(size, "file_switch_cold", measure(lambda: content_cache.get(next(switch_paths)), repeat)))
+    results.append(summarize(size, "file_switch_warm", measure(lambda: content_cache.get(paths[0]), repeat)))
+
+    search_index_path = os.path.join(cache_dir, "search-index.json")
+    search_index = streamlit_app.SearchIndex(search_index_path)
+    results.append(summarize(size, "search_build", measure(lambda: search_index.update(content_index.iter_files()), 1)))
+    results.append(summarize(size, "search_save", measure(search_index.save, 1)))
+    results.append(summarize(size, "search_load", measure(lambda: streamlit_app.SearchIndex(search_index_path), 1)))
+    for query in SEARCH_QUERIES:
+        search_index.search(query)
+        results.append(summarize(size, f"search_query:{query}", measure(lambda: search_index.search(query), repeat)))
+
+    # What the search box pays per query: the same call the viewer makes, snippets included
+    def search_box(query):
+        return streamlit_app.search_markdown_files(content_index, query, search_index=search_index)
+
+    for query in SEARCH_QUERIES:
+        search_box(query)
+        results.append(summarize(size, f"search_box:{query}", measure(lambda: search_box(query), repeat)))
+
+    # A query right after a lesson changed, as the watcher reports it
+    edit_paths = iter(rng.sample(paths, min(len(paths), repeat)))
+
+    def search_box_after_edit():
+        path = next(edit_paths)
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("\nedited\n")
+        content_index.update_path(path)
+        search_box(SEARCH_QUERIES[0])
+
+    results.append(summarize(size, "search_box_after_edit", measure(search_box_after_edit, repeat)))
+
+    shutil.rmtree(root)
+    shutil.rmtree(cache_dir)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="number of Markdown files in each synthetic tree")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="streamlit-app-bench-")
+    try:
+        results = []
+        for size in args.sizes:
+            results.extend(benchmark_tree(size, args.repeat, workdir))
+            print(f"benchmarked {size} files", file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
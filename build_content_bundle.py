@@ -0,0 +1,27 @@
+"""
+Packs the course content into a single bundle file for the Streamlit viewer.
+
+When the bundle exists, streamlit_app serves every lesson from it through one mmap
+instead of walking and opening the content trees.
+
+Usage:
+    python build_content_bundle.py [--output content.bundle] [ROOT ...]
+"""
+import argparse
+import os
+
+import streamlit_app
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("roots", nargs="*", help="content roots to pack (default: every viewer root)")
+    parser.add_argument("--output", default=streamlit_app.CONTENT_BUNDLE_PATH, help="bundle file to write")
+    args = parser.parse_args(argv)
+
+    roots = [os.path.abspath(root) for root in args.roots] or streamlit_app.content_roots()
+    file_count = streamlit_app.build_content_bundle(roots, args.output)
+    print(f"Packed {file_count} files from {len(roots)} roots into {args.output} "
+          f"({os.path.getsize(args.output) / 1024:.0f} KiB)")
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,1766 @@
 import streamlit as st
+import bisect
+import glob
+import hashlib
+import heapq
+import json
+import math
+import mmap
 import os
+import re
+import shutil
+import struct
+import tempfile
+import threading
+import zlib
+from collections import Counter, OrderedDict, deque
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional; ContentWatcher falls back to polling
+    FileSystemEventHandler = object
+    Observer = None
+
+# Directory holding this app and the course content
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Directory where the viewer keeps its persistent indexes between server restarts
+CACHE_DIR = os.path.join(APP_DIR, ".content_cache")
+
+# Bump whenever the layout of a saved index changes so stale files are rebuilt
+INDEX_VERSION = 2
+
+# Number of recent changes a ContentIndex remembers, so consumers can catch up on just
+# the directories that changed
+CHANGE_LOG_LENGTH = 256
+
+# Upper bound on the Markdown bytes kept in memory by the shared ContentCache
+CONTENT_CACHE_BYTES = 64 * 1024 * 1024
+
+# Prebuilt content bundle; when present the viewer serves from it instead of the trees
+CONTENT_BUNDLE_PATH = os.environ.get("CONTENT_BUNDLE", os.path.join(APP_DIR, "content.bundle"))
+
+# Bundle layout: magic and header length, then the JSON header, then the entry data
+BUNDLE_MAGIC = b"PFCBNDL1"
+BUNDLE_PREAMBLE = struct.Struct("<8sQ")
+
+# Seconds between sweeps when ContentWatcher has to poll instead of using watchdog, and
+# how long it collects watchdog events before applying them as one batch
+WATCH_POLL_INTERVAL = 1.0
+
+# Seconds a changed content index waits before it is written to disk, so a burst of
+# changes costs one write
+INDEX_SAVE_DELAY = 2.0
+
+# Directory entries encoded per json.dumps call when an index is saved; other threads
+# get the GIL between calls instead of waiting for the whole file
+INDEX_SAVE_CHUNK = 1000
+
+# Files larger than this are rendered section by section instead of in one block
+STREAMING_THRESHOLD_BYTES = 1024 * 1024
+
+# Number of further sections rendered each time the reader asks for more
+SECTIONS_PER_LOAD = 5
+
+# Lines that open or close a code fence (a run of three or more backticks or tildes,
+# followed by an info string or nothing), or start a heading
+_SECTION_MARKERS = re.compile(rb'^ {0,3}(?P<fence>`{3,}|~{3,})(?P<info>[^\n]*)|^#{1,6}[ \t]', re.MULTILINE)
+
+# Number of files listed per page of the sidebar navigator
+SIDEBAR_PAGE_SIZE = 50
+
+# Location and layout version of the saved full-text search index
+SEARCH_INDEX_PATH = os.path.join(CACHE_DIR, "search-index.json")
+SEARCH_INDEX_VERSION = 1
+
+# BM25 term-frequency saturation and document-length normalisation
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Highest-weighted documents per query term that are scored, so common words stay cheap
+SEARCH_CANDIDATES_PER_TERM = 500
+
+# Relative change in document count or average length after which every cached BM25
+# weight is recomputed, and in a term's document count after which that term's are;
+# smaller drifts only patch in the weights of the changed documents
+SEARCH_WEIGHT_DRIFT = 0.01
+
+# Seconds a changed search index waits before it is written to disk, so a burst of
+# changes costs one write
+SEARCH_SAVE_DELAY = 5.0
+
+# Document changes the search index appends to its journal before it rewrites the full
+# index file instead, which takes seconds on a large corpus
+SEARCH_JOURNAL_MAX_DOCS = 5000
+
+# Bytes of a file searched for a query term when building a result snippet
+SNIPPET_SCAN_BYTES = 256 * 1024
+
+# Words as the search index sees them
+_WORDS = re.compile(r'\w+')
+
+# Runs of digits, so '1.0.91' orders as 1, 0, 91 rather than character by character
+_DIGITS = re.compile(r'(\d+)')
+
+def natural_sort_key(name):
+    """
+    Returns the key used to order directory and file names by their lesson numbers.
+
+    Every run of digits compares as a number wherever it appears, so dotted prefixes
+    such as '1.0.9', '1.0.91' and '1.0.94' sort numerically.
+
+    Parameters:
+    - name: str, a file name or relative directory path.
+
+    Returns:
+    - list, [0, number] and [1, text] pairs; the tags keep numbers and text from ever
+      being compared with each other, and the key survives a JSON round trip.
+    """
+    return [[0, int(part)] if part.isdigit() else [1, part.casefold()]
+            for part in _DIGITS.split(name) if part]
+
+def default_index_path(startpath):
+    """
+    Returns the location of the persistent index for a content root.
+
+    Parameters:
+    - startpath: str, the root directory being indexed.
+
+    Returns:
+    - str, path of the JSON index file inside CACHE_DIR.
+    """
+    digest = hashlib.sha1(os.path.abspath(startpath).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{os.path.basename(startpath)}-{digest}.json")
+
+def _join_relative(relative_dir, name):
+    return name if relative_dir == "." else os.path.join(relative_dir, name)
+
+def _mount_path(mount, relative_dir):
+    return mount if relative_dir == "." else os.path.join(mount, relative_dir)
+
+class ContentIndex:
+    """
+    Persistent, incrementally updated index of the Markdown files under a content root.
+
+    Each directory entry stores the directory mtime, its natural sort key, its
+    subdirectories and its Markdown files as [mtime, size, sort key], plus the file names
+    already in display order. refresh() only re-lists directories whose mtime changed,
+    so keeping the index current costs one stat per directory instead of a full os.walk
+    with a stat per file, and ordering costs nothing on a rerun.
+    """
+
+    def __init__(self, startpath, index_path=None):
+        self.startpath = os.path.normpath(startpath)
+        self.index_path = index_path or default_index_path(self.startpath)
+        self.dirs = {}
+        self.dir_order = None
+        self.tree_counts = None
+        self.watched = False
+        # Bumped on every change, so consumers such as the search index can tell whether
+        # there is anything to catch up on without walking the entries; change_log holds
+        # (version, changed directories) for the most recent changes
+        self.version = 0
+        self.change_log = deque(maxlen=CHANGE_LOG_LENGTH)
+        self.save_timer = None
+        self.lock = threading.Lock()
+        # Serialises writers of the index file
+        self.write_lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """
+        Loads the saved index from disk, ignoring missing, corrupt or outdated files.
+        """
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION and data.get("root") == self.startpath:
+            self.dirs = data["dirs"]
+
+    def save(self):
+        """
+        Writes the index to disk atomically so a crash never leaves a half-written file.
+
+        The lock is only held to take a snapshot: entries are replaced, never changed in
+        place, so a shallow copy of dirs is consistent and readers carry on while it is
+        encoded and written. The JSON is built with json.dumps, INDEX_SAVE_CHUNK entries
+        per call; json.dump streams through the pure-Python encoder and is several times
+        slower here.
+        """
+        with self.write_lock:
+            with self.lock:
+                dirs = list(self.dirs.items())
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            # Several ContentIndex objects of one process may share an index file
+            temp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write(f'{{"version": {INDEX_VERSION}, "root": {json.dumps(self.startpath)}, "dirs": {{')
+                for start in range(0, len(dirs), INDEX_SAVE_CHUNK):
+                    if start:
+                        file.write(", ")
+                    file.write(json.dumps(dict(dirs[start:start + INDEX_SAVE_CHUNK]))[1:-1])
+                file.write("}}")
+            os.replace(temp_path, self.index_path)
+
+    def _scheduled_save(self):
+        with self.lock:
+            self.save_timer = None
+        self.save()
+
+    def full_path(self, relative_dir, filename=None):
+        """
+        Returns the absolute path of an indexed directory or of a file inside it.
+        """
+        path = os.path.normpath(os.path.join(self.startpath, relative_dir))
+        return os.path.join(path, filename) if filename else path
+
+    def refresh(self, stat_files=False):
+        """
+        Brings the index up to date with the filesystem; if anything changed, the index is
+        saved INDEX_SAVE_DELAY seconds later on a background thread.
+
+        Parameters:
+        - stat_files: bool, also stat every indexed file, to catch edits that leave the
+          directory mtime unchanged.
+
+        Returns:
+        - bool, True if any directory or file entry was added, removed or updated.
+        """
+        with self.lock:
+            return self._commit(self._walk(".", force=False, stat_files=stat_files))
+
+    def sync(self):
+        """
+        Refreshes the index on demand, unless a ContentWatcher is already keeping it current.
+        """
+        if not self.watched:
+            self.refresh()
+
+    def poll(self):
+        """
+        Stats every indexed directory and file, then re-lists the directories that changed.
+
+        Like refresh(stat_files=True), but the stat calls run on a snapshot without the
+        lock, so readers only wait for the directories that actually changed.
+
+        Returns:
+        - bool, True if anything changed.
+        """
+        with self.lock:
+            dirs = list(self.dirs.items())
+        changed = [self.full_path(relative_dir) for relative_dir, entry in dirs
+                   if self._dir_changed(relative_dir, entry)]
+        return self.update_paths(changed) if changed else False
+
+    def rescan(self, relative_dir):
+        """
+        Re-lists one directory and brings the subtree below it up to date.
+
+        Returns:
+        - bool, True if anything changed.
+        """
+        with self.lock:
+            return self._commit(self._walk(relative_dir, force=True, stat_files=False))
+
+    def update_path(self, path):
+        """
+        Applies a create, modify, delete or move event for a path under this root.
+
+        Only the affected directory is re-listed, never the whole tree.
+
+        Parameters:
+        - path: str, the file or directory that changed.
+
+        Returns:
+        - bool, True if the index changed.
+        """
+        return self.update_paths([path])
+
+    def update_paths(self, paths):
+        """
+        Applies a batch of change events, re-listing each affected directory once.
+
+        The whole batch is one change, and changes within INDEX_SAVE_DELAY seconds share
+        one background save, so a burst of events (a git checkout, an editor's
+        save-and-rename) costs one JSON write instead of one each.
+
+        Parameters:
+        - paths: iterable of str, the files or directories that changed.
+
+        Returns:
+        - bool, True if the index changed.
+        """
+        with self.lock:
+            target_dirs = {self._target_dir(path) for path in paths}
+            target_dirs.discard(None)
+            changed_dirs = []
+            for target_dir in sorted(target_dirs):
+                try:
+                    changed_dirs.extend(self._walk(target_dir, force=True, stat_files=False))
+                except OSError:
+                    # The directory vanished mid-scan; its delete event arrives in a later batch
+                    continue
+            return self._commit(changed_dirs)
+
+    def _target_dir(self, path):
+        relative_path = os.path.relpath(os.path.normpath(path), self.startpath)
+        if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+            return None
+        parent_dir = os.path.dirname(relative_path) or "."
+        if relative_path in self.dirs:
+            target_dir = relative_path if os.path.isdir(path) else parent_dir
+        elif path.endswith('.md') or os.path.isdir(path):
+            target_dir = parent_dir
+        else:
+            return None
+        # Events can arrive for directories created since the last scan; start from the
+        # nearest ancestor the index already knows
+        while target_dir != "." and target_dir not in self.dirs:
+            target_dir = os.path.dirname(target_dir) or "."
+        return target_dir
+
+    def changes_since(self, version):
+        """
+        Returns what changed after an earlier version of this index.
+
+        Parameters:
+        - version: int, a value of self.version seen earlier.
+
+        Returns:
+        - tuple, (full paths of the directories that changed or disappeared,
+          (path, mtime, size) of every Markdown file now in them), or None when the
+          change log no longer reaches back to version.
+        """
+        with self.lock:
+            if version == self.version:
+                return [], []
+            if version is None or not self.change_log or self.change_log[0][0] > version + 1:
+                return None
+            changed_dirs = {relative_dir for logged_version, dirs in self.change_log
+                            if logged_version > version for relative_dir in dirs}
+            files = [(self.full_path(relative_dir, name), mtime, size)
+                     for relative_dir in changed_dirs if relative_dir in self.dirs
+                     for name, (mtime, size, _) in self.dirs[relative_dir]["files"].items()]
+            return [self.full_path(relative_dir) for relative_dir in changed_dirs], files
+
+    def _walk(self, start_dir, force, stat_files):
+        changed_dirs = []
+        seen = set()
+        pending = [start_dir]
+        while pending:
+            relative_dir = pending.pop()
+            try:
+                dir_mtime = os.stat(self.full_path(relative_dir)).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(relative_dir)
+            entry = self.dirs.get(relative_dir)
+            stale = entry is None or entry["mtime"] != dir_mtime or (force and relative_dir == start_dir)
+            if not stale and stat_files:
+                stale = any(self._file_changed(relative_dir, name, info) for name, info in entry["files"].items())
+            if stale:
+                entry = self._scan_dir(relative_dir, dir_mtime)
+                if entry != self.dirs.get(relative_dir):
+                    changed_dirs.append(relative_dir)
+                self.dirs[relative_dir] = entry
+            pending.extend(_join_relative(relative_dir, name) for name in entry["subdirs"])
+        prefix = "" if start_dir == "." else start_dir + os.sep
+        for relative_dir in [path for path in self.dirs
+                             if path not in seen and (path == start_dir or path.startswith(prefix))]:
+            del self.dirs[relative_dir]
+            changed_dirs.append(relative_dir)
+        return changed_dirs
+
+    def _commit(self, changed_dirs):
+        # Records one version for everything _walk changed and schedules one save
+        if not changed_dirs:
+            return False
+        self.dir_order = None
+        self.tree_counts = None
+        self.version += 1
+        self.change_log.append((self.version, changed_dirs))
+        if self.save_timer is None:
+            self.save_timer = threading.Timer(INDEX_SAVE_DELAY, self._scheduled_save)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+        return True
+
+    def _dir_changed(self, relative_dir, entry):
+        try:
+            if os.stat(self.full_path(relative_dir)).st_mtime_ns != entry["mtime"]:
+                return True
+        except OSError:
+            return True
+        return any(self._file_changed(relative_dir, name, info) for name, info in entry["files"].items())
+
+    def _file_changed(self, relative_dir, name, info):
+        try:
+            stat = os.stat(self.full_path(relative_dir, name))
+        except OSError:
+            return True
+        return [stat.st_mtime_ns, stat.st_size] != info[:2]
+
+    def _scan_dir(self, relative_dir, dir_mtime):
+        subdirs = []
+        files = {}
+        with os.scandir(self.full_path(relative_dir)) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.name.endswith('.md') and entry.is_file():
+                    stat = entry.stat()
+                    files[entry.name] = [stat.st_mtime_ns, stat.st_size, natural_sort_key(entry.name)]
+        return {
+            "mtime": dir_mtime,
+            "key": natural_sort_key(relative_dir),
+            "subdirs": sorted(subdirs, key=natural_sort_key),
+            "files": files,
+            "order": sorted(files, key=lambda name: files[name][2]),
+        }
+
+    def markdown_files(self):
+        """
+        Returns the indexed files in the layout produced by list_markdown_files().
+        """
+        with self.lock:
+            return {
+                relative_dir: {name: self.full_path(relative_dir, name) for name in entry["files"]}
+                for relative_dir, entry in self.dirs.items()
+                if entry["files"]
+            }
+
+    def iter_files(self):
+        """
+        Yields (path, mtime, size) for every indexed Markdown file.
+        """
+        with self.lock:
+            for relative_dir, entry in self.dirs.items():
+                for name, (mtime, size, _) in entry["files"].items():
+                    yield self.full_path(relative_dir, name), mtime, size
+
+    def sorted_dirs(self):
+        """
+        Returns the directories holding Markdown files, in natural lesson order.
+        """
+        with self.lock:
+            if self.dir_order is None:
+                self.dir_order = sorted(
+                    (relative_dir for relative_dir, entry in self.dirs.items() if entry["files"]),
+                    key=lambda relative_dir: self.dirs[relative_dir]["key"],
+                )
+            return self.dir_order
+
+    def child_dirs(self, relative_dir):
+        """
+        Returns the subdirectories of a directory that contain Markdown files at any depth,
+        in natural lesson order.
+        """
+        with self.lock:
+            if self.tree_counts is None:
+                self.tree_counts = self._count_tree()
+            entry = self.dirs.get(relative_dir)
+            if entry is None:
+                return []
+            return [name for name in entry["subdirs"]
+                    if self.tree_counts.get(_join_relative(relative_dir, name), 0)]
+
+    def _count_tree(self):
+        # Deepest directories first, so each directory's total is final before its
+        # parent adds it in
+        counts = {}
+        depth = lambda path: -1 if path == "." else path.count(os.sep)
+        for relative_dir in sorted(self.dirs, key=depth, reverse=True):
+            entry = self.dirs[relative_dir]
+            counts[relative_dir] = len(entry["files"]) + sum(
+                counts.get(_join_relative(relative_dir, name), 0) for name in entry["subdirs"])
+        return counts
+
+    def sorted_files(self, relative_dir):
+        """
+        Returns the Markdown file names of a directory, in natural lesson order.
+        """
+        with self.lock:
+            entry = self.dirs.get(relative_dir)
+            return entry["order"] if entry else []
+
+@st.cache_resource
+def get_content_index(startpath):
+    """
+    Returns the ContentIndex for a root, shared by every session in this server process.
+    """
+    return ContentIndex(startpath)
 
 def list_markdown_files(startpath):
     """
     Lists all Markdown files in the specified directory and its subdirectories, organized by directory.
 
+    The listing is served from a persistent ContentIndex, so only directories that changed
+    since the last call are re-read from disk.
+
     Parameters:
     - startpath: str, the root directory to start searching from.
 
     Returns:
     - dict, a nested dictionary where keys are directory paths and values are dictionaries mapping filenames to their full paths.
     """
-    markdown_files = {}
-    for root, dirs, files in os.walk(startpath):
-        markdown_paths = {file: os.path.join(root, file) for file in files if file.endswith('.md')}
-        if markdown_paths:
-            relative_root = os.path.relpath(root, startpath)
-            markdown_files[relative_root] = markdown_paths
-    return markdown_files
+    index = get_content_index(os.path.normpath(startpath))
+    index.sync()
+    return index.markdown_files()
+
+def content_roots():
+    """
+    Returns the content trees served by the viewer: Learning/Basics, Introduction, every
+    Module folder and PFC1, skipping any that are missing.
+    """
+    roots = ["Learning/Basics", "Introduction"] + [
+        os.path.basename(path) for path in glob.glob(os.path.join(APP_DIR, "Module*"))
+    ] + ["PFC1"]
+    return tuple(
+        os.path.normpath(os.path.join(APP_DIR, root))
+        for root in roots
+        if os.path.isdir(os.path.join(APP_DIR, root))
+    )
+
+def refresh_indexes(indexes):
+    """
+    Refreshes several content indexes one after another.
+
+    Scanning is mostly Python work (building entries and natural sort keys) that holds
+    the GIL, so threads do not overlap it, and worker processes would each have to
+    import this app and Streamlit, which takes longer than scanning the course roots.
+    A cold start therefore takes the sum of the roots; warm starts only stat directories.
+
+    Parameters:
+    - indexes: iterable of ContentIndex.
+
+    Returns:
+    - bool, True if any index changed.
+    """
+    changed = False
+    for index in indexes:
+        changed = index.refresh() or changed
+    return changed
+
+class MergedContentIndex:
+    """
+    Several content roots presented as one tree.
+
+    Each root keeps its own ContentIndex and is mounted under its path relative to the
+    app, e.g. 'Module3' or 'Learning/Basics'. Directory paths in the merged namespace are
+    '<mount>/<path inside the root>', and the mounts themselves are the top-level
+    directories, in natural lesson order. The methods mirror ContentIndex, so the sidebar
+    navigator and search work on either.
+    """
+
+    def __init__(self, indexes):
+        self.mounts = {
+            os.path.relpath(index.startpath, APP_DIR): index
+            for index in sorted(indexes, key=lambda index: natural_sort_key(index.startpath))
+        }
+        # Longest mount first, so 'Learning/Basics' wins over a 'Learning' mount
+        self.routes = sorted(self.mounts.items(), key=lambda item: len(item[0]), reverse=True)
+
+    @property
+    def version(self):
+        """
+        Changes whenever any root's index changes.
+        """
+        return tuple(index.version for index in self.mounts.values())
+
+    def changes_since(self, version):
+        """
+        Returns what changed in any root after an earlier version, like
+        ContentIndex.changes_since(), or None if any root cannot tell.
+        """
+        if version is None or len(version) != len(self.mounts):
+            return None
+        changed_dirs, files = [], []
+        for index, index_version in zip(self.mounts.values(), version):
+            changes = index.changes_since(index_version)
+            if changes is None:
+                return None
+            changed_dirs.extend(changes[0])
+            files.extend(changes[1])
+        return changed_dirs, files
+
+    def _route(self, relative_dir):
+        for mount, index in self.routes:
+            if relative_dir == mount:
+                return mount, index, "."
+            if relative_dir.startswith(mount + os.sep):
+                return mount, index, relative_dir[len(mount) + 1:]
+        return None, None, None
+
+    def sync(self):
+        """
+        Refreshes every root that is not kept current by a ContentWatcher.
+        """
+        refresh_indexes(index for index in self.mounts.values() if not index.watched)
+
+    def refresh(self):
+        """
+        Refreshes every root.
+        """
+        return refresh_indexes(self.mounts.values())
+
+    def full_path(self, relative_dir, filename=None):
+        """
+        Returns the absolute path of a merged directory or of a file inside it.
+        """
+        mount, index, inner_dir = self._route(relative_dir)
+        if index is None:
+            raise KeyError(relative_dir)
+        return index.full_path(inner_dir, filename)
+
+    def child_dirs(self, relative_dir):
+        """
+        Returns the subdirectories holding lessons; at the top level these are the mounts.
+        """
+        if relative_dir == ".":
+            return [mount for mount, index in self.mounts.items()
+                    if index.child_dirs(".") or index.sorted_files(".")]
+        mount, index, inner_dir = self._route(relative_dir)
+        return index.child_dirs(inner_dir) if index else []
+
+    def sorted_files(self, relative_dir):
+        """
+        Returns the Markdown file names of a merged directory, in natural lesson order.
+        """
+        mount, index, inner_dir = self._route(relative_dir)
+        return index.sorted_files(inner_dir) if index else []
+
+    def sorted_dirs(self):
+        """
+        Returns every merged directory holding Markdown files, in natural lesson order.
+        """
+        return [_mount_path(mount, relative_dir)
+                for mount, index in self.mounts.items()
+                for relative_dir in index.sorted_dirs()]
+
+    def markdown_files(self):
+        """
+        Returns every root's files in the layout produced by list_markdown_files().
+        """
+        return {_mount_path(mount, relative_dir): files
+                for mount, index in self.mounts.items()
+                for relative_dir, files in index.markdown_files().items()}
+
+    def iter_files(self):
+        """
+        Yields (path, mtime, size) for every Markdown file in every root.
+        """
+        for index in self.mounts.values():
+            yield from index.iter_files()
+
+@st.cache_resource
+def get_merged_content_index(roots):
+    """
+    Returns the MergedContentIndex for a set of roots, shared by every session in this
+    server process. The roots are scanned when it is first created.
+
+    Parameters:
+    - roots: tuple of str, the content roots to mount.
+    """
+    merged_index = MergedContentIndex(get_content_index(root) for root in roots)
+    merged_index.refresh()
+    return merged_index
+
+def read_text_file(path):
+    """
+    Reads a UTF-8 text file from disk, bypassing every cache.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+class ContentCache:
+    """
+    Bounded LRU cache of decoded Markdown files, keyed by (path, mtime, size).
+
+    An entry is only served while the file's mtime and size still match, so edits on
+    disk are picked up on the next view. Least recently used entries are evicted once
+    the cached content exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes=CONTENT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, path):
+        """
+        Returns the content of a file, reading it from disk only on a miss.
+
+        Parameters:
+        - path: str, path to the Markdown file.
+
+        Returns:
+        - str, content of the file.
+        """
+        stat = os.stat(path)
+        return self.fetch(path, (stat.st_mtime_ns, stat.st_size), read_text_file)
+
+    def fetch(self, path, key, load):
+        """
+        Returns the content cached for path under key, calling load(path) on a miss.
+
+        Parameters:
+        - path: str, the cache entry's name.
+        - key: tuple, (mtime, size) the cached entry must match.
+        - load: callable, returns the content of path as a str.
+
+        Returns:
+        - str, the content.
+        """
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry[0] == key:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        content = load(path)
+        self.put(path, key, content)
+        return content
+
+    def put(self, path, key, content):
+        """
+        Stores content under its (mtime, size) key, evicting old entries to stay in budget.
+        """
+        size = key[1]
+        with self.lock:
+            self._discard(path)
+            if size > self.max_bytes:
+                return
+            self.entries[path] = (key, content)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                self._discard(next(iter(self.entries)))
+
+    def invalidate(self, path):
+        """
+        Drops the cached content of a file, if any.
+        """
+        with self.lock:
+            self._discard(path)
+
+    def _discard(self, path):
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.total_bytes -= entry[0][1]
+
+    def stats(self):
+        """
+        Returns the cache's occupancy and hit ratio.
+
+        Returns:
+        - dict, with entries, bytes, max_bytes, hits, misses and hit_ratio.
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+@st.cache_resource
+def get_content_cache():
+    """
+    Returns the ContentCache shared by every session in this server process.
+    """
+    return ContentCache()
+
+def build_content_bundle(roots, bundle_path):
+    """
+    Packs the Markdown files of several content roots into one indexed bundle file.
+
+    The bundle starts with BUNDLE_MAGIC and the header length, followed by a JSON header
+    holding each mount's directory tree and, per file, [offset, stored length, size,
+    mtime, compressed]. Each file is stored on its own, zlib-compressed when that saves
+    space, so any entry can be read without touching the others. Files larger than
+    STREAMING_THRESHOLD_BYTES are stored uncompressed so they can be streamed straight
+    out of the memory map.
+
+    Parameters:
+    - roots: iterable of str, the content roots to pack.
+    - bundle_path: str, where to write the bundle.
+
+    Returns:
+    - int, number of files packed.
+    """
+    merged_index = MergedContentIndex(ContentIndex(root) for root in roots)
+    merged_index.refresh()
+    mounts = {}
+    file_count = 0
+    output_dir = os.path.dirname(os.path.abspath(bundle_path))
+    with tempfile.TemporaryFile(dir=output_dir) as data:
+        for mount, index in merged_index.mounts.items():
+            dirs = {}
+            for relative_dir in sorted(index.dirs, key=natural_sort_key):
+                files = {}
+                for name in index.sorted_files(relative_dir):
+                    with open(index.full_path(relative_dir, name), "rb") as file:
+                        raw = file.read()
+                        mtime = os.fstat(file.fileno()).st_mtime_ns
+                    stored = raw
+                    if len(raw) <= STREAMING_THRESHOLD_BYTES:
+                        compressed = zlib.compress(raw)
+                        if len(compressed) < len(raw):
+                            stored = compressed
+                    files[name] = [data.tell(), len(stored), len(raw), mtime, stored is not raw]
+                    data.write(stored)
+                    file_count += 1
+                dirs[relative_dir] = {
+                    "subdirs": index.child_dirs(relative_dir),
+                    "order": index.sorted_files(relative_dir),
+                    "files": files,
+                }
+            mounts[mount] = dirs
+        header = json.dumps({"version": 1, "mounts": mounts}).encode("utf-8")
+        data.seek(0)
+        temp_path = f"{bundle_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as bundle:
+            bundle.write(BUNDLE_PREAMBLE.pack(BUNDLE_MAGIC, len(header)))
+            bundle.write(header)
+            shutil.copyfileobj(data, bundle)
+    os.replace(temp_path, bundle_path)
+    return file_count
+
+class ContentBundle:
+    """
+    Read-only content tree served from a file written by build_content_bundle().
+
+    Opening a bundle is one open, one mmap and one JSON parse of the header. Entries are
+    sliced out of the map as memoryviews without copying; compressed entries are
+    decompressed from that view. Files keep the paths they had under APP_DIR, and the
+    navigation methods mirror MergedContentIndex, so the rest of the viewer does not
+    care where the content comes from.
+    """
+
+    watched = True
+    version = 0
+
+    def __init__(self, bundle_path):
+        self.bundle_path = bundle_path
+        with open(bundle_path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = BUNDLE_PREAMBLE.unpack_from(self.map)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"{bundle_path} is not a content bundle")
+        data_start = BUNDLE_PREAMBLE.size + header_length
+        self.data = memoryview(self.map)[data_start:]
+        header = json.loads(self.map[BUNDLE_PREAMBLE.size:data_start])
+        self.mounts = header["mounts"]
+        self.routes = sorted(self.mounts.items(), key=lambda item: len(item[0]), reverse=True)
+        self.entries = {
+            self.full_path(_mount_path(mount, relative_dir), name): entry
+            for mount, dirs in self.mounts.items()
+            for relative_dir, dir_entry in dirs.items()
+            for name, entry in dir_entry["files"].items()
+        }
+
+    def __contains__(self, path):
+        return path in self.entries
+
+    def _route(self, relative_dir):
+        for mount, dirs in self.routes:
+            if relative_dir == mount:
+                return mount, dirs, "."
+            if relative_dir.startswith(mount + os.sep):
+                return mount, dirs, relative_dir[len(mount) + 1:]
+        return None, None, None
+
+    def sync(self):
+        """
+        Does nothing; a bundle never changes while it is being served.
+        """
+
+    def changes_since(self, version):
+        """
+        Returns no changes for the bundle's own version, None for anything else.
+        """
+        return ([], []) if version == self.version else None
+
+    def full_path(self, relative_dir, filename=None):
+        """
+        Returns the path a bundled directory or file had under APP_DIR.
+        """
+        path = os.path.normpath(os.path.join(APP_DIR, relative_dir))
+        return os.path.join(path, filename) if filename else path
+
+    def child_dirs(self, relative_dir):
+        """
+        Returns the subdirectories holding lessons; at the top level these are the mounts.
+        """
+        if relative_dir == ".":
+            return sorted(self.mounts, key=natural_sort_key)
+        mount, dirs, inner_dir = self._route(relative_dir)
+        return dirs[inner_dir]["subdirs"] if dirs and inner_dir in dirs else []
+
+    def sorted_files(self, relative_dir):
+        """
+        Returns the Markdown file names of a bundled directory, in natural lesson order.
+        """
+        mount, dirs, inner_dir = self._route(relative_dir)
+        return dirs[inner_dir]["order"] if dirs and inner_dir in dirs else []
+
+    def sorted_dirs(self):
+        """
+        Returns every bundled directory holding Markdown files, in natural lesson order.
+        """
+        return [_mount_path(mount, relative_dir)
+                for mount in sorted(self.mounts, key=natural_sort_key)
+                for relative_dir, dir_entry in self.mounts[mount].items()
+                if dir_entry["files"]]
+
+    def markdown_files(self):
+        """
+        Returns the bundled files in the layout produced by list_markdown_files().
+        """
+        return {
+            _mount_path(mount, relative_dir): {
+                name: self.full_path(_mount_path(mount, relative_dir), name) for name in dir_entry["order"]
+            }
+            for mount, dirs in self.mounts.items()
+            for relative_dir, dir_entry in dirs.items()
+            if dir_entry["files"]
+        }
+
+    def iter_files(self):
+        """
+        Yields (path, mtime, size) for every bundled file.
+        """
+        for path, (offset, length, size, mtime, compressed) in self.entries.items():
+            yield path, mtime, size
+
+    def key(self, path):
+        """
+        Returns the (mtime, size) a bundled file had when it was packed.
+        """
+        offset, length, size, mtime, compressed = self.entries[path]
+        return mtime, size
+
+    def view(self, path):
+        """
+        Returns the bytes of a bundled file: a zero-copy slice of the map for stored
+        entries, or the decompressed bytes for compressed ones.
+        """
+        offset, length, size, mtime, compressed = self.entries[path]
+        stored = self.data[offset:offset + length]
+        return zlib.decompress(stored) if compressed else stored
+
+    def read(self, path):
+        """
+        Returns the content of a bundled file as a str.
+        """
+        return str(self.view(path), "utf-8")
+
+@st.cache_resource
+def get_content_bundle(bundle_path=CONTENT_BUNDLE_PATH):
+    """
+    Returns the ContentBundle at bundle_path, or None if no bundle has been built.
+    """
+    return ContentBundle(bundle_path) if os.path.exists(bundle_path) else None
+
+def read_markdown_source(path):
+    """
+    Returns the content of a Markdown file from the bundle if it holds the file, or from
+    disk otherwise, without going through the ContentCache.
+    """
+    bundle = get_content_bundle()
+    if bundle is not None and path in bundle:
+        return bundle.read(path)
+    return read_text_file(path)
+
+def markdown_file_key(path):
+    """
+    Returns the (mtime, size) of a Markdown file, wherever it is served from.
+    """
+    bundle = get_content_bundle()
+    if bundle is not None and path in bundle:
+        return bundle.key(path)
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+class _WatchdogHandler(FileSystemEventHandler):
+    """
+    Forwards watchdog events to a ContentWatcher.
+    """
+
+    def __init__(self, watcher):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        self.watcher.notify(event.src_path)
+        if getattr(event, "dest_path", ""):
+            self.watcher.notify(event.dest_path)
+
+class ContentWatcher:
+    """
+    Keeps content indexes and the content cache in step with the filesystem.
+
+    With watchdog installed (inotify on Linux), create, modify, delete and move events are
+    collected for WATCH_POLL_INTERVAL seconds, then every directory they touched is
+    re-listed once. Without it, a background thread polls the indexes every
+    WATCH_POLL_INTERVAL seconds, stat-ing files outside the index lock and re-listing
+    only the directories that changed. Changed indexes are saved in the background. Either way, watched indexes stop refreshing themselves on
+    every rerun.
+    """
+
+    def __init__(self, indexes, content_cache, poll_interval=WATCH_POLL_INTERVAL):
+        self.indexes = list(indexes)
+        self.content_cache = content_cache
+        self.poll_interval = poll_interval
+        self.stopped = threading.Event()
+        self.observer = None
+        self.thread = None
+        self.pending = set()
+        self.pending_lock = threading.Lock()
+
+    def start(self):
+        """
+        Starts watching for changes, then brings every index up to date once.
+        """
+        if Observer is not None:
+            self.observer = Observer()
+            handler = _WatchdogHandler(self)
+            for index in self.indexes:
+                self.observer.schedule(handler, index.startpath, recursive=True)
+            self.observer.daemon = True
+            self.observer.start()
+            target = self._apply_events
+        else:
+            target = self._poll
+        self.thread = threading.Thread(target=target, name="content-watcher", daemon=True)
+        self.thread.start()
+        # Catch up on anything that changed before the watch began
+        refresh_indexes(self.indexes)
+        for index in self.indexes:
+            index.watched = True
+
+    def stop(self):
+        """
+        Stops watching; the indexes go back to refreshing on demand.
+        """
+        self.stopped.set()
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+        if self.thread is not None:
+            self.thread.join()
+        self.flush()
+        for index in self.indexes:
+            index.watched = False
+
+    def notify(self, path):
+        """
+        Queues a change to a file or directory for the next batch.
+
+        The cached content is dropped straight away, so the next read sees the new file
+        even before the indexes catch up.
+
+        Parameters:
+        - path: str, the path that was created, modified or deleted.
+        """
+        path = os.path.normpath(path)
+        with self.pending_lock:
+            self.pending.add(path)
+        self.content_cache.invalidate(path)
+
+    def flush(self):
+        """
+        Applies every queued change to the indexes.
+
+        Returns:
+        - bool, True if any index changed.
+        """
+        with self.pending_lock:
+            paths, self.pending = self.pending, set()
+        if not paths:
+            return False
+        changed = False
+        for index in self.indexes:
+            changed = index.update_paths(paths) or changed
+        return changed
+
+    def _apply_events(self):
+        while not self.stopped.wait(self.poll_interval):
+            self.flush()
+
+    def _poll(self):
+        while not self.stopped.wait(self.poll_interval):
+            for index in self.indexes:
+                try:
+                    index.poll()
+                except OSError:
+                    # A directory vanished mid-sweep; the next sweep sees the settled tree
+                    continue
+
+@st.cache_resource
+def get_content_watcher(roots):
+    """
+    Returns the ContentWatcher for a set of roots, started once per server process.
+
+    Parameters:
+    - roots: tuple of str, the content roots to watch.
+    """
+    watcher = ContentWatcher((get_content_index(root) for root in roots), get_content_cache())
+    watcher.start()
+    return watcher
+
+def tokenize(text):
+    """
+    Splits text into the lower-cased words used by the search index.
+
+    Parameters:
+    - text: str, document or query text.
+
+    Returns:
+    - list, the words in text order.
+    """
+    return _WORDS.findall(text.casefold())
+
+def read_snippet(path, terms, width=200):
+    """
+    Returns the part of a Markdown file around the first occurrence of any query term,
+    without reading or caching all of it.
+
+    The file is memory-mapped (or viewed in the content bundle), its first
+    SNIPPET_SCAN_BYTES are searched for a query term, and only the bytes around the
+    match are decoded. The ContentCache is bypassed, so large lessons that turn up in
+    results are not pulled into memory.
+
+    Parameters:
+    - path: str, the Markdown file.
+    - terms: iterable of str, the query terms.
+    - width: int, maximum number of characters in the snippet.
+
+    Returns:
+    - str, a single-line excerpt with ellipses marking cut text, empty if the file cannot
+      be read.
+    """
+    bundle = get_content_bundle()
+    if bundle is not None and path in bundle:
+        return _buffer_snippet(bundle.view(path), terms, width)
+    try:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return _buffer_snippet(content, terms, width)
+    except OSError:
+        return ""
+
+def _buffer_snippet(buffer, terms, width):
+    terms = [term.encode("utf-8") for term in terms]
+    pattern = re.compile(rb'\b(?:' + b'|'.join(re.escape(term) for term in terms) + rb')\b', re.IGNORECASE)
+    match = pattern.search(buffer, 0, SNIPPET_SCAN_BYTES) if terms else None
+    start = max(0, match.start() - width // 3) if match else 0
+    # A UTF-8 character is at most 4 bytes; a character cut at either end is dropped
+    window = bytes(buffer[start:start + 4 * width])
+    text = window.decode("utf-8", "ignore")[:width]
+    excerpt = ' '.join(text.split())
+    prefix = "..." if start > 0 else ""
+    suffix = "..." if start + len(text.encode("utf-8")) < len(buffer) else ""
+    return f"{prefix}{excerpt}{suffix}"
+
+class SearchIndex:
+    """
+    Persistent inverted index over Markdown files, ranked with BM25.
+
+    postings maps each term to {doc id: term frequency}; doc_terms and dir_docs map each
+    document to its terms and each directory to its documents, so an update touches only
+    the changed documents' postings. update() re-tokenizes only files whose (mtime, size)
+    changed, and the index is saved to disk so a server restart does not re-tokenize the
+    corpus. Per-term BM25 weights are computed on first use and kept, sorted best first;
+    an update patches in the weights of the documents it changed, and a term's weights
+    are only recomputed once the document count, the average length or the number of
+    documents with that term has drifted by more than SEARCH_WEIGHT_DRIFT. A query scores
+    only the SEARCH_CANDIDATES_PER_TERM best documents of each term, so common words cost
+    no more than rare ones.
+
+    Changes reach disk as lines appended to a journal next to the index file, replayed
+    by load(), so an edit costs a write the size of the edited documents; the full index
+    is rewritten, and the journal emptied, once it holds SEARCH_JOURNAL_MAX_DOCS changes.
+    """
+
+    def __init__(self, index_path=SEARCH_INDEX_PATH):
+        self.index_path = index_path
+        self.journal_path = f"{index_path}.journal"
+        self.docs = {}
+        self.doc_ids = {}
+        self.postings = {}
+        self.doc_terms = {}
+        self.dir_docs = {}
+        self.total_length = 0
+        self.next_id = 0
+        self.weights = {}
+        # (document count, average length) the cached weights were computed with
+        self.weights_basis = None
+        # (id, version) of the content index last passed to sync_with()
+        self.synced_source = None
+        self.save_timer = None
+        # (removed paths, added paths) of updates not yet on disk, and the number of
+        # document changes already in the journal
+        self.pending = []
+        self.journal_docs = 0
+        self.lock = threading.Lock()
+        # Serialises the writers of the index and journal files
+        self.write_lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """
+        Loads the saved index and replays its journal, ignoring corrupt or outdated files.
+
+        A small corpus may only ever have been written to the journal, so the journal is
+        replayed even when the full index file is missing.
+        """
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except OSError:
+            self._replay_journal()
+            return
+        except ValueError:
+            return
+        if data.get("version") != SEARCH_INDEX_VERSION:
+            return
+        self.docs = {doc_id: [path, mtime, size, length] for doc_id, path, mtime, size, length in data["docs"]}
+        self.doc_ids = {doc[0]: doc_id for doc_id, doc in self.docs.items()}
+        self.postings = {term: dict(zip(ids, counts)) for term, (ids, counts) in data["postings"].items()}
+        self.doc_terms = {doc_id: [] for doc_id in self.docs}
+        for term, docs in self.postings.items():
+            for doc_id in docs:
+                self.doc_terms[doc_id].append(term)
+        self.dir_docs = {}
+        for doc_id, doc in self.docs.items():
+            self.dir_docs.setdefault(doc[0].rpartition(os.sep)[0], set()).add(doc_id)
+        self.total_length = sum(doc[3] for doc in self.docs.values())
+        self.next_id = max(self.docs, default=-1) + 1
+        self._replay_journal()
+
+    def _replay_journal(self):
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as file:
+                lines = file.readlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+                removed, added = record["remove"], record["add"]
+            except (ValueError, KeyError, TypeError):
+                break  # A write cut short by a crash; the next sync re-reads those files
+            # Records are replayed whole, so one the full index already holds is harmless
+            self._remove([path for path in removed if path in self.doc_ids])
+            for path, mtime, size, counts in added:
+                if path in self.doc_ids:
+                    self._remove([path])
+                self._insert(path, mtime, size, counts)
+            self.journal_docs += len(removed) + len(added)
+
+    def save(self):
+        """
+        Writes the full index to disk atomically and empties the journal.
+        """
+        with self.write_lock:
+            with self.lock:
+                data = {
+                    "version": SEARCH_INDEX_VERSION,
+                    "docs": [[doc_id, *doc] for doc_id, doc in self.docs.items()],
+                    "postings": {term: [list(docs), list(docs.values())] for term, docs in self.postings.items()},
+                }
+                self.pending = []
+                self.journal_docs = 0
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write(json.dumps(data))
+            os.replace(temp_path, self.index_path)
+            try:
+                os.remove(self.journal_path)
+            except FileNotFoundError:
+                pass
+
+    def save_changes(self):
+        """
+        Appends the changes made since the last write to the journal, or rewrites the
+        full index when the journal would grow past SEARCH_JOURNAL_MAX_DOCS changes.
+        """
+        with self.write_lock:
+            with self.lock:
+                changes = sum(len(removed) + len(added) for removed, added in self.pending)
+                if not changes:
+                    return
+                if self.journal_docs + changes > SEARCH_JOURNAL_MAX_DOCS:
+                    records = None
+                else:
+                    # Documents are written as they are now; a later change to one of them
+                    # is in a later record, so replaying both still ends in the right state
+                    records = [{"remove": removed,
+                                "add": [self._journal_entry(path) for path in added if path in self.doc_ids]}
+                               for removed, added in self.pending]
+                    self.pending = []
+                    self.journal_docs += changes
+            if records is not None:
+                os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+                with open(self.journal_path, "a", encoding="utf-8") as file:
+                    file.write("".join(json.dumps(record) + "\n" for record in records))
+                return
+        self.save()
+
+    def _journal_entry(self, path):
+        doc_id = self.doc_ids[path]
+        return [*self.docs[doc_id][:3], {term: self.postings[term][doc_id] for term in self.doc_terms[doc_id]}]
+
+    def save_later(self, delay=SEARCH_SAVE_DELAY):
+        """
+        Schedules save_changes() on a background thread after delay seconds, unless one
+        is already scheduled; every change made until then goes into that one write.
+        """
+        with self.lock:
+            if self.save_timer is None:
+                self.save_timer = threading.Timer(delay, self._scheduled_save)
+                self.save_timer.daemon = True
+                self.save_timer.start()
+
+    def _scheduled_save(self):
+        with self.lock:
+            self.save_timer = None
+        self.save_changes()
+
+    def update(self, files, read_text=read_text_file, within=None):
+        """
+        Synchronises the index with the given files.
+
+        Parameters:
+        - files: iterable of (path, mtime, size) for every document that should be searchable.
+        - read_text: callable, returns the content of a path; reads from disk by default.
+        - within: iterable of str, directories the files were listed from; documents
+          elsewhere are left alone. By default files covers the whole corpus.
+
+        Returns:
+        - bool, True if any document was added, changed or removed.
+        """
+        current = {path: (mtime, size) for path, mtime, size in files}
+        with self.lock:
+            if within is None:
+                indexed = self.doc_ids
+            else:
+                indexed = {self.docs[doc_id][0]: doc_id for directory in set(within)
+                           for doc_id in self.dir_docs.get(directory, ())}
+            stale = [path for path, doc_id in indexed.items()
+                     if tuple(self.docs[doc_id][1:3]) != current.get(path)]
+            removed = self._remove(stale)
+            added = [self._add(path, *current[path], read_text)
+                     for path in current if path not in self.doc_ids]
+            changed = bool(removed or added)
+            if changed:
+                self._patch_weights(removed, added)
+                self.pending.append((stale, [self.docs[doc_id][0] for doc_id in added]))
+            return changed
+
+    def sync_with(self, content_index, read_text=read_text_file):
+        """
+        Updates the index from a content index, but only if that index changed since the
+        last call, and then only from the directories that changed when the content index
+        can list them. If any document changed, the index is saved in the background
+        shortly after, so the query that noticed the change does not wait for the write.
+
+        Parameters:
+        - content_index: ContentIndex, MergedContentIndex or ContentBundle.
+        - read_text: callable, returns the content of a path.
+
+        Returns:
+        - bool, True if any document was added, changed or removed.
+        """
+        # Read the version before listing files: a change that lands during the update
+        # bumps it again, so the next call catches up
+        source = (id(content_index), content_index.version)
+        if source == self.synced_source:
+            return False
+        changes = None
+        if self.synced_source is not None and self.synced_source[0] == source[0]:
+            changes = content_index.changes_since(self.synced_source[1])
+        if changes is None:
+            changed = self.update(content_index.iter_files(), read_text)
+        else:
+            changed_dirs, files = changes
+            changed = self.update(files, read_text, within=changed_dirs)
+        if changed:
+            self.save_later()
+        self.synced_source = source
+        return changed
+
+    def _add(self, path, mtime, size, read_text):
+        try:
+            terms = tokenize(read_text(path))
+        except (OSError, UnicodeDecodeError):
+            # Keep unreadable files as empty documents so they are not retried every update
+            terms = []
+        return self._insert(path, mtime, size, Counter(terms))
+
+    def _insert(self, path, mtime, size, counts):
+        doc_id = self.next_id
+        self.next_id += 1
+        length = sum(counts.values())
+        self.docs[doc_id] = [path, mtime, size, length]
+        self.doc_ids[path] = doc_id
+        self.dir_docs.setdefault(path.rpartition(os.sep)[0], set()).add(doc_id)
+        self.total_length += length
+        for term, count in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        self.doc_terms[doc_id] = list(counts)
+        return doc_id
+
+    def _remove(self, paths):
+        """
+        Drops documents from the index; returns {doc id: terms} of the removed documents.
+        """
+        removed = {}
+        for path in paths:
+            doc_id = self.doc_ids.pop(path)
+            self.total_length -= self.docs.pop(doc_id)[3]
+            # Indexed paths are built as directory + separator + name, so rpartition
+            # recovers the directory without os.path.dirname's normalisation
+            directory = path.rpartition(os.sep)[0]
+            self.dir_docs[directory].discard(doc_id)
+            if not self.dir_docs[directory]:
+                del self.dir_docs[directory]
+            removed[doc_id] = self.doc_terms.pop(doc_id)
+            for term in removed[doc_id]:
+                docs = self.postings[term]
+                del docs[doc_id]
+                if not docs:
+                    del self.postings[term]
+        return removed
+
+    def _patch_weights(self, removed, added):
+        """
+        Brings the cached term weights up to date after documents were removed and added.
+
+        Every weight depends on the document count and average length, and a term's also
+        on how many documents contain it, but a few edits barely move them. Cached terms
+        keep the values they were computed with, and only the weights of the changed
+        documents are taken out or put in, so an edit to a document full of common words
+        does not re-sort tens of thousands of weights per word. Small terms are simply
+        recomputed on their next use.
+        """
+        if self.weights_basis is None:
+            return
+        count = len(self.docs)
+        average_length = self.total_length / count if count else 0.0
+        basis_count, basis_length = self.weights_basis
+        if (abs(count - basis_count) > SEARCH_WEIGHT_DRIFT * basis_count
+                or abs(average_length - basis_length) > SEARCH_WEIGHT_DRIFT * basis_length):
+            self.weights = {}
+            self.weights_basis = None
+            return
+
+        def cached(term):
+            weights = self.weights.get(term)
+            if weights is not None:
+                docs = self.postings.get(term, {})
+                if (len(docs) <= SEARCH_CANDIDATES_PER_TERM
+                        or abs(len(docs) - weights[3]) > SEARCH_WEIGHT_DRIFT * weights[3]):
+                    del self.weights[term]
+                    return None
+            return weights
+
+        for doc_id, terms in removed.items():
+            for term in terms:
+                weights = cached(term)
+                if weights is not None:
+                    by_doc, ranked = weights[:2]
+                    weight = by_doc.pop(doc_id)
+                    del ranked[bisect.bisect_left(ranked, (-weight, doc_id))]
+        for doc_id in added:
+            length_norm = 1 - BM25_B + BM25_B * self.docs[doc_id][3] / basis_length
+            for term in self.doc_terms[doc_id]:
+                weights = cached(term)
+                if weights is not None:
+                    by_doc, ranked, idf = weights[:3]
+                    frequency = self.postings[term][doc_id]
+                    weight = by_doc[doc_id] = idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * length_norm)
+                    bisect.insort(ranked, (-weight, doc_id))
+
+    def _term_weights(self, term):
+        """
+        Returns ({doc id: BM25 weight}, [(-weight, doc id)] best first, idf, number of
+        documents with the term) for a term.
+        """
+        weights = self.weights.get(term)
+        if weights is None:
+            docs = self.postings.get(term, {})
+            if self.weights_basis is None:
+                count = len(self.docs)
+                self.weights_basis = (count, self.total_length / count if count else 0.0)
+            # Weights computed later in the same basis stay comparable with the cached ones
+            count, average_length = self.weights_basis
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            by_doc = {}
+            for doc_id, frequency in docs.items():
+                length_norm = 1 - BM25_B + BM25_B * self.docs[doc_id][3] / average_length
+                by_doc[doc_id] = idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * length_norm)
+            # Negated weights keep the list in ascending order, so bisect can patch it
+            ranked = sorted((-weight, doc_id) for doc_id, weight in by_doc.items())
+            weights = self.weights[term] = (by_doc, ranked, idf, len(docs))
+        return weights
+
+    def search(self, query, limit=10):
+        """
+        Ranks the indexed documents against a query with BM25.
+
+        Candidates are the best-weighted documents of each query term, and each candidate
+        gets its full score over all terms. A document is only missed if, for every term,
+        SEARCH_CANDIDATES_PER_TERM others weigh more.
+
+        Parameters:
+        - query: str, free text; every word contributes to the score.
+        - limit: int, maximum number of results.
+
+        Returns:
+        - list, (path, score) pairs, best match first.
+        """
+        with self.lock:
+            term_weights = [self._term_weights(term) for term in set(tokenize(query))]
+            candidates = set()
+            for _, ranked, _, _ in term_weights:
+                candidates.update(doc_id for _, doc_id in ranked[:max(limit, SEARCH_CANDIDATES_PER_TERM)])
+            scores = {doc_id: sum(weights[0].get(doc_id, 0.0) for weights in term_weights) for doc_id in candidates}
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(self.docs[doc_id][0], score) for doc_id, score in best]
+
+@st.cache_resource
+def get_search_index():
+    """
+    Returns the SearchIndex shared by every session in this server process.
+    """
+    return SearchIndex()
+
+def search_markdown_files(content_index, query, limit=10, search_index=None):
+    """
+    Searches every Markdown file of a content index.
+
+    The content index is synced first. The search index only compares its documents with
+    the content index when that index reports a change, and then only new or changed
+    files are tokenized; otherwise a query costs the ranking and the snippets alone.
+
+    Parameters:
+    - content_index: ContentIndex or MergedContentIndex, the files to search.
+    - query: str, the search text.
+    - limit: int, maximum number of results.
+    - search_index: SearchIndex, the index to query; the shared one by default.
+
+    Returns:
+    - list, dictionaries with path, score and snippet, best match first.
+    """
+    search_index = search_index or get_search_index()
+    content_index.sync()
+    search_index.sync_with(content_index, read_markdown_source)
+    terms = set(tokenize(query))
+    return [
+        {"path": path, "score": score, "snippet": read_snippet(path, terms)}
+        for path, score in search_index.search(query, limit)
+    ]
+
+def split_markdown_sections(content, size):
+    """
+    Returns the (start, end) byte offsets of the sections of Markdown content, split at
+    headings outside code fences.
+
+    As in CommonMark, a fence is only closed by a run of the same character at least as
+    long as the one that opened it, with nothing after it but whitespace, so a ``` line
+    inside a ~~~ block (or a shorter run inside a longer one) stays part of the code.
+
+    Parameters:
+    - content: bytes-like, the document, e.g. an mmap or a memoryview.
+    - size: int, length of the document in bytes.
+    """
+    starts = [0]
+    open_fence = None  # The backtick or tilde run that opened the current code block
+    for marker in _SECTION_MARKERS.finditer(content):
+        fence = marker.group("fence")
+        if fence is None:
+            if open_fence is None and marker.start() > 0:
+                starts.append(marker.start())
+        elif open_fence is None:
+            # Backtick fences cannot carry backticks in their info string
+            if fence[:1] == b"~" or b"`" not in marker.group("info"):
+                open_fence = fence
+        elif fence[:1] == open_fence[:1] and len(fence) >= len(open_fence) and not marker.group("info").strip():
+            open_fence = None
+    return list(zip(starts, starts[1:] + [size]))
+
+@st.cache_data(max_entries=64)
+def markdown_section_offsets(path, mtime_ns, size):
+    """
+    Splits a Markdown file into sections at its headings, without reading it into memory.
+
+    The file is scanned through a memory map, or straight out of the content bundle's
+    map when the bundle holds it. mtime_ns and size are part of the cache key, so an
+    edited file is re-split.
+
+    Parameters:
+    - path: str, path to the Markdown file.
+    - mtime_ns: int, modification time of the file in nanoseconds.
+    - size: int, size of the file in bytes.
+
+    Returns:
+    - list, (start, end) byte offsets of each section, in document order.
+    """
+    bundle = get_content_bundle()
+    if bundle is not None and path in bundle:
+        return split_markdown_sections(bundle.view(path), size)
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+        return split_markdown_sections(content, size)
+
+def read_markdown_section(path, start, end):
+    """
+    Returns one section of a Markdown file, copying only that byte range out of a memory map.
+    """
+    bundle = get_content_bundle()
+    if bundle is not None and path in bundle:
+        return str(bundle.view(path)[start:end], "utf-8")
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+        return content[start:end].decode("utf-8")
+
+def render_markdown_file(path):
+    """
+    Renders a Markdown file, streaming large files one batch of sections at a time.
+
+    Files up to STREAMING_THRESHOLD_BYTES are rendered in one block. Larger files show
+    their first section straight away, and each press of the "load more" button renders
+    the next SECTIONS_PER_LOAD sections, so neither the server nor the browser ever holds
+    more of the document than the reader has asked for.
+
+    Parameters:
+    - path: str, path to the Markdown file.
+    """
+    mtime_ns, size = markdown_file_key(path)
+    if size <= STREAMING_THRESHOLD_BYTES:
+        st.markdown(load_markdown_file(path), unsafe_allow_html=True)
+        return
+    sections = markdown_section_offsets(path, mtime_ns, size)
+    state_key = f"sections-shown:{path}"
+    shown = st.session_state.get(state_key, 1)
+    for start, end in sections[:shown]:
+        st.markdown(read_markdown_section(path, start, end), unsafe_allow_html=True)
+    if shown < len(sections) and st.button(f"Load more ({len(sections) - shown} sections left)"):
+        st.session_state[state_key] = shown + SECTIONS_PER_LOAD
+        st.rerun()
+
+def select_markdown_file(content_index):
+    """
+    Lets the user walk the content tree in the sidebar, one directory level at a time.
+
+    Only the children of the directories on the selected branch are read from the index,
+    and long file lists are split into pages of SIDEBAR_PAGE_SIZE, so the widgets stay
+    small however large the tree is.
+
+    Parameters:
+    - content_index: ContentIndex or MergedContentIndex, the content tree to browse.
+
+    Returns:
+    - str or None, full path of the selected Markdown file.
+    """
+    relative_dir = "."
+    level = 0
+    while True:
+        subdirs = content_index.child_dirs(relative_dir)
+        if not subdirs:
+            break
+        # A directory with its own lessons can also be picked without descending further
+        options = ([""] if content_index.sorted_files(relative_dir) else []) + subdirs
+        selected = st.sidebar.selectbox(
+            "Select a module:" if level == 0 else "Select a section:",
+            options=options,
+            format_func=lambda name: name or "(lessons in this folder)",
+            key=f"navigator-{level}",
+        )
+        if not selected:
+            break
+        relative_dir = _join_relative(relative_dir, selected)
+        level += 1
+
+    filenames = content_index.sorted_files(relative_dir)
+    if len(filenames) > SIDEBAR_PAGE_SIZE:
+        pages = math.ceil(len(filenames) / SIDEBAR_PAGE_SIZE)
+        page = st.sidebar.number_input(f"Page (of {pages}):", min_value=1, max_value=pages, value=1)
+        filenames = filenames[(page - 1) * SIDEBAR_PAGE_SIZE:page * SIDEBAR_PAGE_SIZE]
+    selected_filename = st.sidebar.selectbox("Select a file:", options=filenames)
+    return content_index.full_path(relative_dir, selected_filename) if selected_filename else None
 
 def main():
-    # Base directory for modules
-    modules_dir = "Learning/Basics"
-    
-    # Normalize and construct absolute path
-    modules_path = os.path.normpath(os.path.join(os.path.dirname(__file__), modules_dir))
-    
-    # List all Markdown files
-    markdown_files = list_markdown_files(modules_path)
-    
-    # Sort directories by their prefix numbers
-    sorted_dirs = sorted(markdown_files.keys(), key=lambda x: [int(part) if part.isdigit() else part for part in x.split('/')])
-    
-    # Sidebar - select a module directory
-    selected_dir = st.sidebar.selectbox("Select a module:", options=sorted_dirs)
-    
-    # Sidebar - select a file within the selected directory
-    if selected_dir:
-        # Get filenames (keys) and sort them by their prefix numbers
-        filenames = sorted(markdown_files[selected_dir].keys(), key=lambda x: [int(part) if part.isdigit() else part for part in x.split('_')])
-        selected_filename = st.sidebar.selectbox("Select a file:", options=filenames)
-        
-        # Find the full path of the selected file
-        if selected_filename:
-            selected_file_path = markdown_files[selected_dir][selected_filename]
-            file_content = load_markdown_file(selected_file_path)
-            st.markdown(file_content, unsafe_allow_html=True)
+    # Serve from a prebuilt content bundle when there is one; otherwise every content
+    # tree is mounted into one index, scanned on first use
+    content_index = get_content_bundle()
+    if content_index is None:
+        roots = content_roots()
+        content_index = get_merged_content_index(roots)
+        get_content_watcher(roots)
+        content_index.sync()
+
+    # Sidebar - full-text search across every content root
+    selected_file_path = None
+    query = st.sidebar.text_input("Search lessons:")
+    if query:
+        results = search_markdown_files(content_index, query)
+        if not results:
+            st.sidebar.write("No lessons match your search.")
+        for result in results:
+            st.sidebar.markdown(f"**{os.path.relpath(result['path'], APP_DIR)}**  \n{result['snippet']}")
+        selected_result = st.sidebar.selectbox(
+            "Open a search result:",
+            options=[""] + [os.path.relpath(result["path"], APP_DIR) for result in results],
+        )
+        if selected_result:
+            selected_file_path = os.path.join(APP_DIR, selected_result)
+
+    # Sidebar - browse the content tree, unless a search result was opened
+    navigator_file_path = select_markdown_file(content_index)
+    if selected_file_path is None:
+        selected_file_path = navigator_file_path
+
+    if selected_file_path:
+        render_markdown_file(selected_file_path)
+
+    # Sidebar - report how well the shared content cache is doing
+    cache_stats = get_content_cache().stats()
+    st.sidebar.caption(
+        f"Content cache: {cache_stats['entries']} files, "
+        f"{cache_stats['bytes'] / 1024:.0f} of {cache_stats['max_bytes'] / 1024:.0f} KiB, "
+        f"hit ratio {cache_stats['hit_ratio']:.0%}"
+    )
 
 def load_markdown_file(markdown_file_path):
     """
     Reads a Markdown file and returns the content as a string.
 
+    Files held by the content bundle are read from it. Repeat views are answered from the
+    shared ContentCache without touching the file's contents, as long as its mtime and
+    size are unchanged.
+
     Parameters:
     - markdown_file_path: str, path to the Markdown file.
 
     Returns:
     - str, content of the Markdown file.
     """
-    with open(markdown_file_path, "r", encoding="utf-8") as file:
-        return file.read()
+    return get_content_cache().fetch(markdown_file_path, markdown_file_key(markdown_file_path), read_markdown_source)
 
 if __name__ == "__main__":
     main()